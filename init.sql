@@ -23,6 +23,12 @@ CREATE TABLE IF NOT EXISTS users (
     metadata JSONB DEFAULT '{}'
 );
 
+-- User IDs mentioned in message text (<@U123> or <@U123|name>)
+CREATE OR REPLACE FUNCTION extract_mentions(body TEXT) RETURNS TEXT[] AS $$
+    SELECT COALESCE(array_agg(DISTINCT m[1]), '{}')
+    FROM regexp_matches(COALESCE(body, ''), '<@([A-Z0-9]+)[|>]', 'g') AS m
+$$ LANGUAGE sql IMMUTABLE PARALLEL SAFE;
+
 -- Messages table
 CREATE TABLE IF NOT EXISTS messages (
     id SERIAL PRIMARY KEY,
@@ -37,9 +43,14 @@ CREATE TABLE IF NOT EXISTS messages (
     created_at TIMESTAMP WITH TIME ZONE,
     updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
     metadata JSONB DEFAULT '{}',
+    mentioned_users TEXT[] GENERATED ALWAYS AS (extract_mentions(text)) STORED,
     UNIQUE(channel_id, ts)
 );
 
+-- Databases created before mentioned_users existed
+ALTER TABLE messages ADD COLUMN IF NOT EXISTS mentioned_users TEXT[]
+    GENERATED ALWAYS AS (extract_mentions(text)) STORED;
+
 -- Reactions table
 CREATE TABLE IF NOT EXISTS reactions (
     id SERIAL PRIMARY KEY,
@@ -63,9 +74,44 @@ CREATE TABLE IF NOT EXISTS message_embeddings (
 CREATE TABLE IF NOT EXISTS sync_state (
     channel_id VARCHAR(20) PRIMARY KEY REFERENCES channels(id),
     last_ts VARCHAR(20),  -- Last synced message timestamp
+    catchup_gaps JSONB NOT NULL DEFAULT '[]',  -- Unfetched backlog ranges as [oldest, cursor] ts pairs, newest first
     last_sync_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
 );
 
+-- Databases created before backlog catch-up existed
+ALTER TABLE sync_state ADD COLUMN IF NOT EXISTS catchup_gaps JSONB NOT NULL DEFAULT '[]';
+
+-- Threads each user has posted in (thread root ts, or the message's own ts for top-level posts)
+-- Maintained by trg_messages_thread_participation so status checks avoid scanning messages
+CREATE TABLE IF NOT EXISTS user_thread_participation (
+    user_id VARCHAR(20) NOT NULL,
+    channel_id VARCHAR(20) NOT NULL REFERENCES channels(id),
+    thread_ts VARCHAR(20) NOT NULL,
+    PRIMARY KEY (user_id, channel_id, thread_ts)
+);
+
+CREATE OR REPLACE FUNCTION record_thread_participation() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO user_thread_participation (user_id, channel_id, thread_ts)
+    VALUES (NEW.user_id, NEW.channel_id, COALESCE(NEW.thread_ts, NEW.ts))
+    ON CONFLICT DO NOTHING;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_messages_thread_participation ON messages;
+CREATE TRIGGER trg_messages_thread_participation
+    AFTER INSERT OR UPDATE OF user_id, thread_ts ON messages
+    FOR EACH ROW WHEN (NEW.user_id IS NOT NULL)
+    EXECUTE FUNCTION record_thread_participation();
+
+-- Backfill for databases created before the trigger existed
+INSERT INTO user_thread_participation (user_id, channel_id, thread_ts)
+SELECT DISTINCT user_id, channel_id, COALESCE(thread_ts, ts)
+FROM messages
+WHERE user_id IS NOT NULL
+ON CONFLICT DO NOTHING;
+
 -- Reminders (from Slack's deprecated API)
 CREATE TABLE IF NOT EXISTS reminders (
     id VARCHAR(20) PRIMARY KEY,
@@ -84,8 +130,13 @@ CREATE INDEX IF NOT EXISTS idx_messages_channel_ts ON messages(channel_id, ts);
 CREATE INDEX IF NOT EXISTS idx_messages_thread ON messages(channel_id, thread_ts) WHERE thread_ts IS NOT NULL;
 CREATE INDEX IF NOT EXISTS idx_messages_user ON messages(user_id);
 CREATE INDEX IF NOT EXISTS idx_messages_created ON messages(created_at);
+CREATE INDEX IF NOT EXISTS idx_messages_mentions ON messages USING GIN (mentioned_users);
+-- Full-text search; queries must use the same to_tsvector('simple', text) expression
+CREATE INDEX IF NOT EXISTS idx_messages_text_fts ON messages USING GIN (to_tsvector('simple', text));
 CREATE INDEX IF NOT EXISTS idx_reactions_message ON reactions(message_id);
 CREATE INDEX IF NOT EXISTS idx_reactions_user ON reactions(user_id);
+-- Only pending reminders are ever queried; completed ones stay out of the index
+CREATE INDEX IF NOT EXISTS idx_reminders_pending ON reminders(user_id, time) WHERE complete_ts IS NULL;
 
 -- Vector similarity search index (using IVFFlat for better performance on large datasets)
 -- Note: This index should be created after initial data load for best performance
@@ -10,18 +10,21 @@ Usage:
     python scripts/poc_polling.py
 
 Requirements:
-    pip install slack-sdk
+    pip install slack-sdk aiohttp
 """
 
 import asyncio
+import functools
 import logging
 import os
 import sys
-from collections import defaultdict
-from datetime import datetime
+import time
+from collections import OrderedDict
 from typing import Any
 
+import aiohttp
 from slack_sdk.errors import SlackApiError
+from slack_sdk.http_retry.builtin_async_handlers import AsyncRateLimitErrorRetryHandler
 from slack_sdk.web.async_client import AsyncWebClient
 
 
@@ -32,21 +35,91 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Max channels polled concurrently; keeps us well inside Slack's Tier 3 limits
+MAX_PARALLEL_CHANNELS = 6
+# History page sizes: a baseline page on first sync, small pages once a cursor exists
+INITIAL_HISTORY_LIMIT = 200
+STEADY_HISTORY_LIMIT = 20
+# Upper bound on remembered messages; oldest entries are evicted first
+SEEN_MESSAGES_MAXSIZE = 100_000
+UNRESOLVED_USERS_MAXSIZE = 20_000
+
+
+def _ts_key(ts: str) -> float:
+    """Sort key for Slack timestamps (compare numerically, not lexically)."""
+    try:
+        return float(ts)
+    except ValueError:
+        return 0.0
+
+
+@functools.lru_cache(maxsize=4096)
+def _fmt_hms(sec: int) -> str:
+    """Format epoch seconds as local HH:MM:SS (memoized, strftime is comparatively slow)."""
+    return time.strftime('%H:%M:%S', time.localtime(sec))
+
+
+class LRUCache(OrderedDict):
+    """Size-bounded mapping that evicts the least recently used entry."""
+
+    def __init__(self, maxsize: int):
+        super().__init__()
+        self.maxsize = maxsize
+
+    def __getitem__(self, key: Any) -> Any:
+        value = super().__getitem__(key)
+        self.move_to_end(key)
+        return value
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        return self[key] if key in self else default
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        if key in self:
+            self.move_to_end(key)
+        super().__setitem__(key, value)
+        if len(self) > self.maxsize:
+            self.popitem(last=False)
+
+
+_NO_REACTIONS = hash(())
+
+
+def _message_signature(msg: dict) -> tuple[int, int]:
+    """Minimal state needed to detect changes: (reply_count, hash of sorted reactions)."""
+    reactions = tuple(sorted((r.get('name', ''), r.get('count', 0)) for r in msg.get('reactions', [])))
+    return msg.get('reply_count', 0), hash(reactions)
+
 
 class SlackPoller:
     """Polls Slack conversations for new messages and reactions."""
 
-    def __init__(self, token: str, poll_interval: int = 60):
-        self.client = AsyncWebClient(token=token)
+    def __init__(self, token: str, poll_interval: int = 60, session: aiohttp.ClientSession | None = None):
+        # Back off on HTTP 429 using the Retry-After header instead of fixed sleeps
+        self.client = AsyncWebClient(
+            token=token,
+            session=session,
+            retry_handlers=[AsyncRateLimitErrorRetryHandler(max_retry_count=3)],
+        )
         self.poll_interval = poll_interval
+        self._channel_sem = asyncio.Semaphore(MAX_PARALLEL_CHANNELS)
         # Track last seen timestamp per channel to avoid duplicates
         self.channel_cursors: dict[str, str] = {}
-        # Track seen message timestamps to detect new reactions
-        self.seen_messages: dict[str, dict[str, Any]] = defaultdict(dict)
+        # Track seen (channel_id, ts) -> signature to detect new messages and reactions.
+        # This script has no database, so only tiny signatures are kept (never message bodies);
+        # the daemon (slack_assistant.slack.poller) dedups against Postgres via upserts instead.
+        self.seen_messages: LRUCache = LRUCache(SEEN_MESSAGES_MAXSIZE)
         self.user_id: str | None = None
         self.user_name: str | None = None
-        # Cache for user ID -> display name mapping
+        # User ID -> display name for the whole roster, filled from users.list. Unbounded on purpose:
+        # it is the only source of names, so evicting entries would only trigger roster refetches
         self.users_cache: dict[str, str] = {}
+        # IDs seen in messages but missing from the cache, refilled in batches
+        self._unknown_users: set[str] = set()
+        # IDs a refill didn't resolve (deleted, external, bots); kept out of later refills
+        self._unresolved_users: LRUCache = LRUCache(UNRESOLVED_USERS_MAXSIZE)
+        self.channels: list[dict] = []
+        self.team: dict[str, Any] = {}
 
     async def authenticate(self) -> bool:
         """Verify token and get current user info."""
@@ -93,23 +166,94 @@ class SlackPoller:
             logger.error(f'Failed to fetch conversations: {e.response["error"]}')
             return []
 
+    async def _prefetch_users(self) -> set[str] | None:
+        """Populate the users cache from a single paginated users.list fetch.
+
+        Returns the IDs users.list returned, or None if the fetch failed.
+        """
+        cursor = None
+        returned: set[str] = set()
+
+        try:
+            while True:
+                response = await self.client.users_list(limit=1000, cursor=cursor)
+
+                for user in response.get('members', []):
+                    returned.add(user['id'])
+                    self.users_cache[user['id']] = (
+                        user.get('profile', {}).get('display_name')
+                        or user.get('real_name')
+                        or user.get('name')
+                        or user['id']
+                    )
+
+                cursor = response.get('response_metadata', {}).get('next_cursor')
+                if not cursor:
+                    break
+
+            logger.info(f'Prefetched {len(self.users_cache)} users')
+            return returned
+
+        except SlackApiError as e:
+            logger.warning(f'Failed to prefetch users: {e.response["error"]}')
+            return None
+
+    async def _fetch_team(self) -> None:
+        """Fetch workspace info once."""
+        try:
+            response = await self.client.team_info()
+            self.team = response.get('team', {})
+        except SlackApiError as e:
+            logger.warning(f'Failed to fetch team info: {e.response["error"]}')
+
+    async def _init(self) -> bool:
+        """Fetch identity, users, channels and team in one concurrent round."""
+        authenticated, _, self.channels, _ = await asyncio.gather(
+            self.authenticate(),
+            self._prefetch_users(),
+            self.get_all_conversations(),
+            self._fetch_team(),
+        )
+        return authenticated
+
+    async def _refill_unknown_users(self) -> None:
+        """Re-read the roster if messages referenced users we don't know yet."""
+        if not self._unknown_users:
+            return
+        logger.debug(f'Refilling users cache for {len(self._unknown_users)} unknown users')
+        returned = await self._prefetch_users()
+        if returned is None:
+            return
+        # users.list never returns some IDs; remember them so they don't force a refill every time
+        for user_id in self._unknown_users - returned:
+            self._unresolved_users[user_id] = True
+        self._unknown_users.clear()
+
     async def get_channel_history(self, channel_id: str, oldest: str | None = None) -> list[dict]:
-        """Fetch messages from a channel since the given timestamp."""
+        """Fetch messages from a channel strictly newer than the given timestamp."""
         messages = []
 
         try:
-            kwargs = {
-                'channel': channel_id,
-                'limit': 100,
-            }
+            kwargs: dict[str, Any] = {'channel': channel_id}
             if oldest:
+                # Steady state: let Slack filter out everything we've already seen,
+                # so quiet channels come back (nearly) empty; inclusive=False excludes the cursor itself
                 kwargs['oldest'] = oldest
+                kwargs['inclusive'] = False
+                kwargs['limit'] = STEADY_HISTORY_LIMIT
+            else:
+                kwargs['limit'] = INITIAL_HISTORY_LIMIT
 
-            response = await self.client.conversations_history(**kwargs)
-            messages = response.get('messages', [])
+            while True:
+                response = await self.client.conversations_history(**kwargs)
+                messages.extend(response.get('messages', []))
 
-            # Note: We're not paginating here for POC simplicity
-            # In production, we'd handle cursor pagination
+                # Initial sync only needs a baseline page; incremental polls must not drop
+                # messages, so page through anything newer than the cursor
+                cursor = response.get('response_metadata', {}).get('next_cursor')
+                if not oldest or not response.get('has_more') or not cursor:
+                    break
+                kwargs['cursor'] = cursor
 
         except SlackApiError as e:
             error = e.response.get('error', 'unknown')
@@ -119,6 +263,21 @@ class SlackPoller:
 
         return messages
 
+    async def _channel_has_new(self, channel_id: str, cursor: str) -> bool:
+        """Check via conversations.info whether the channel has activity past the cursor."""
+        try:
+            response = await self.client.conversations_info(channel=channel_id, include_num_members=False)
+        except SlackApiError as e:
+            logger.debug(f'Failed to fetch info for {channel_id}: {e.response["error"]}')
+            return True
+
+        latest = response.get('channel', {}).get('latest')
+        latest_ts = latest.get('ts') if isinstance(latest, dict) else None
+        if not latest_ts:
+            # Not every conversation type reports `latest`; fall back to fetching history
+            return True
+        return _ts_key(latest_ts) > _ts_key(cursor)
+
     async def get_thread_replies(self, channel_id: str, thread_ts: str) -> list[dict]:
         """Fetch replies in a thread."""
         try:
@@ -133,46 +292,33 @@ class SlackPoller:
             logger.warning(f'Failed to fetch thread {thread_ts}: {e.response["error"]}')
             return []
 
-    async def get_user_name(self, user_id: str) -> str:
-        """Get user display name, with caching."""
+    def get_user_name(self, user_id: str) -> str:
+        """Get user display name from the prefetched cache."""
         if not user_id:
             return 'unknown'
 
-        if user_id in self.users_cache:
-            return self.users_cache[user_id]
-
-        try:
-            response = await self.client.users_info(user=user_id)
-            user = response.get('user', {})
-            # Prefer display_name, fall back to real_name, then name
-            name = (
-                user.get('profile', {}).get('display_name')
-                or user.get('real_name')
-                or user.get('name')
-                or user_id
-            )
-            self.users_cache[user_id] = name
+        if name := self.users_cache.get(user_id):
             return name
-        except SlackApiError as e:
-            logger.debug(f'Failed to get user info for {user_id}: {e.response["error"]}')
-            self.users_cache[user_id] = user_id
-            return user_id
 
-    async def get_user_names(self, user_ids: list[str]) -> list[str]:
+        # No per-user users.info call; unknown IDs are picked up by the next batched refill
+        if user_id not in self._unresolved_users:
+            self._unknown_users.add(user_id)
+        return user_id
+
+    def get_user_names(self, user_ids: list[str]) -> list[str]:
         """Get display names for multiple users."""
-        return [await self.get_user_name(uid) for uid in user_ids]
+        return [self.get_user_name(uid) for uid in user_ids]
 
-    async def format_message(self, msg: dict, channel_name: str) -> str:
+    def format_message(self, msg: dict, channel_name: str) -> str:
         """Format a message for logging."""
         ts = msg.get('ts', '')
         user_id = msg.get('user', 'unknown')
-        user_name = await self.get_user_name(user_id)
+        user_name = self.get_user_name(user_id)
         text = msg.get('text', '')[:100]  # Truncate for readability
 
         # Format timestamp
         try:
-            dt = datetime.fromtimestamp(float(ts))
-            time_str = dt.strftime('%H:%M:%S')
+            time_str = _fmt_hms(int(float(ts)))
         except (ValueError, TypeError):
             time_str = ts
 
@@ -182,82 +328,88 @@ class SlackPoller:
 
         return f'[{time_str}] #{channel_name} <{user_name}>{thread_indicator}: {text}'
 
-    async def format_reactions(self, msg: dict, channel_name: str) -> list[str]:
+    def format_reactions(self, msg: dict, channel_name: str) -> list[str]:
         """Format reactions for logging."""
         reactions = msg.get('reactions', [])
         if not reactions:
             return []
 
-        lines = []
-        for reaction in reactions:
-            name = reaction.get('name', '')
-            count = reaction.get('count', 0)
-            user_ids = reaction.get('users', [])
-            user_names = await self.get_user_names(user_ids)
-            lines.append(f'  Reaction :{name}: x{count} from {user_names}')
+        # Resolve every reacting user once, then format from the local mapping
+        all_user_ids = {uid for r in reactions for uid in r.get('users', [])}
+        names = dict(zip(all_user_ids, self.get_user_names(list(all_user_ids))))
 
-        return lines
+        return [
+            f'  Reaction :{r.get("name", "")}: x{r.get("count", 0)} from {[names[uid] for uid in r.get("users", [])]}'
+            for r in reactions
+        ]
 
     async def poll_once(self, channels: list[dict]) -> None:
         """Poll all channels once and log new messages/reactions."""
-        for channel in channels:
+        results = await asyncio.gather(*(self._poll_channel(channel) for channel in channels), return_exceptions=True)
+        for channel, result in zip(channels, results):
+            if isinstance(result, Exception):
+                logger.warning(f'Failed to poll {channel["id"]}: {result!r}')
+
+    async def _poll_channel(self, channel: dict) -> None:
+        """Poll a single channel, bounded by the shared concurrency limit."""
+        async with self._channel_sem:
             channel_id = channel['id']
             channel_name = channel.get('name') or channel.get('user') or channel_id
             oldest = self.channel_cursors.get(channel_id)
 
+            # Cheap summary check first; skip the full history fetch for quiet channels
+            if oldest and not await self._channel_has_new(channel_id, oldest):
+                return
+
             messages = await self.get_channel_history(channel_id, oldest)
 
             if not messages:
-                continue
-
-            # Messages are returned newest-first, reverse for chronological logging
-            messages = list(reversed(messages))
+                return
 
-            for msg in messages:
+            # Messages are returned newest-first; iterate in reverse for chronological logging
+            for msg in reversed(messages):
                 msg_ts = msg.get('ts', '')
-                msg_key = f'{channel_id}:{msg_ts}'
+                msg_key = (channel_id, msg_ts)
+                signature = _message_signature(msg)
 
                 # Check if this is a new message
-                is_new = msg_key not in self.seen_messages
+                old_signature = self.seen_messages.get(msg_key)
+                is_new = old_signature is None
 
+                formatted_msg = None
                 if is_new:
-                    formatted_msg = await self.format_message(msg, channel_name)
+                    formatted_msg = self.format_message(msg, channel_name)
                     logger.info(f'NEW: {formatted_msg}')
 
                     # Check for thread replies
                     if msg.get('reply_count', 0) > 0:
                         replies = await self.get_thread_replies(channel_id, msg_ts)
                         for reply in replies:
-                            reply_key = f'{channel_id}:{reply.get("ts", "")}'
+                            reply_key = (channel_id, reply.get('ts', ''))
                             if reply_key not in self.seen_messages:
-                                formatted_reply = await self.format_message(reply, channel_name)
+                                formatted_reply = self.format_message(reply, channel_name)
                                 logger.info(f'  REPLY: {formatted_reply}')
-                                self.seen_messages[reply_key] = reply
+                                self.seen_messages[reply_key] = _message_signature(reply)
 
                 # Check for new reactions
-                old_reactions = self.seen_messages.get(msg_key, {}).get('reactions', [])
-                new_reactions = msg.get('reactions', [])
-
-                if new_reactions != old_reactions:
-                    formatted_msg = await self.format_message(msg, channel_name)
-                    reaction_lines = await self.format_reactions(msg, channel_name)
-                    for line in reaction_lines:
-                        logger.info(f'REACTION: {formatted_msg}\n{line}')
+                old_reactions = old_signature[1] if old_signature else _NO_REACTIONS
 
-                self.seen_messages[msg_key] = msg
+                if signature[1] != old_reactions:
+                    if formatted_msg is None:
+                        formatted_msg = self.format_message(msg, channel_name)
+                    reaction_lines = self.format_reactions(msg, channel_name)
+                    logger.info('\n'.join([f'REACTION: {formatted_msg}', *reaction_lines]))
 
-            # Update cursor to the newest message timestamp
-            if messages:
-                newest_ts = messages[-1].get('ts', '')
-                if newest_ts:
-                    self.channel_cursors[channel_id] = newest_ts
+                self.seen_messages[msg_key] = signature
 
-            # Small delay to avoid rate limits
-            await asyncio.sleep(0.1)
+            # Advance cursor to the newest timestamp seen so far
+            newest_ts = max((msg.get('ts', '') for msg in messages), key=_ts_key)
+            if newest_ts and (oldest is None or _ts_key(newest_ts) > _ts_key(oldest)):
+                self.channel_cursors[channel_id] = newest_ts
 
     async def run(self) -> None:
         """Main polling loop."""
-        if not await self.authenticate():
+        if not await self._init():
             logger.error('Failed to authenticate. Check your SLACK_USER_TOKEN.')
             return
 
@@ -265,8 +417,7 @@ class SlackPoller:
         logger.info('Send messages in Slack to see them appear here...')
         logger.info('Press Ctrl+C to stop\n')
 
-        # Get initial channel list
-        channels = await self.get_all_conversations()
+        channels = self.channels
         if not channels:
             logger.error('No conversations found. Check token scopes.')
             return
@@ -278,6 +429,7 @@ class SlackPoller:
 
         # Main polling loop
         poll_count = 0
+        users_refresh_every = max(1, 3600 // self.poll_interval)
         while True:
             try:
                 await asyncio.sleep(self.poll_interval)
@@ -287,6 +439,11 @@ class SlackPoller:
                 # Refresh channel list periodically
                 if poll_count % 10 == 0:
                     channels = await self.get_all_conversations()
+                    await self._refill_unknown_users()
+
+                # Refresh users roughly once an hour
+                if poll_count % users_refresh_every == 0:
+                    await self._prefetch_users()
 
                 await self.poll_once(channels)
 
@@ -307,12 +464,15 @@ async def main():
 
     poll_interval = int(os.environ.get('POLL_INTERVAL_SECONDS', '60'))
 
-    poller = SlackPoller(token, poll_interval)
+    # One keep-alive session for every Slack API call in the run
+    connector = aiohttp.TCPConnector(limit=20, keepalive_timeout=60, ttl_dns_cache=300)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        poller = SlackPoller(token, poll_interval, session=session)
 
-    try:
-        await poller.run()
-    except KeyboardInterrupt:
-        logger.info('Interrupted by user')
+        try:
+            await poller.run()
+        except KeyboardInterrupt:
+            logger.info('Interrupted by user')
 
 
 if __name__ == '__main__':
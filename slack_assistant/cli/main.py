@@ -5,14 +5,18 @@ import asyncio
 import logging
 import sys
 from datetime import datetime
+from functools import cache
 
 import click
 
-from slack_assistant.config import get_config
+from slack_assistant.config import Config, get_config
 from slack_assistant.db.connection import close_pool, get_pool
+from slack_assistant.db.models import Reminder
 from slack_assistant.db.repository import Repository
+from slack_assistant.services.embeddings import EmbeddingService
+from slack_assistant.services.search import SearchService
 from slack_assistant.services.status import Priority, StatusService
-from slack_assistant.slack.client import SlackClient
+from slack_assistant.slack.client import SlackClient, close_http_session
 from slack_assistant.slack.poller import SlackPoller
 
 
@@ -24,11 +28,29 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+@cache
+def _require_config() -> Config:
+    """Load and validate configuration once per process."""
+    config = get_config()
+    errors = config.validate()
+    if errors:
+        raise click.ClickException('\n'.join(f'Config error: {error}' for error in errors))
+    return config
+
+
 def run_async(coro):
     """Run an async coroutine."""
     return asyncio.run(coro)
 
 
+async def _connect(client: SlackClient) -> None:
+    """Open the database pool and authenticate with Slack concurrently."""
+    _, authenticated = await asyncio.gather(get_pool(), client.authenticate())
+    if not authenticated:
+        click.echo('Failed to authenticate with Slack', err=True)
+        sys.exit(1)
+
+
 @click.group()
 @click.option('--debug', is_flag=True, help='Enable debug logging')
 def cli(debug: bool):
@@ -40,12 +62,7 @@ def cli(debug: bool):
 @cli.command()
 def daemon():
     """Start the background polling daemon."""
-    config = get_config()
-    errors = config.validate()
-    if errors:
-        for error in errors:
-            click.echo(f'Config error: {error}', err=True)
-        sys.exit(1)
+    config = _require_config()
 
     async def run_daemon():
         client = SlackClient(config.slack_user_token)
@@ -53,7 +70,7 @@ def daemon():
 
         try:
             # Ensure database is ready
-            await get_pool()
+            await _connect(client)
             logger.info('Connected to database')
 
             poller = SlackPoller(client, repository)
@@ -62,6 +79,7 @@ def daemon():
             logger.info('Interrupted by user')
         finally:
             await close_pool()
+            await close_http_session()
 
     click.echo('Starting Slack Assistant daemon...')
     run_async(run_daemon())
@@ -71,22 +89,14 @@ def daemon():
 @click.option('--hours', default=24, help='Hours to look back (default: 24)')
 def status(hours: int):
     """Get status of items needing attention."""
-    config = get_config()
-    errors = config.validate()
-    if errors:
-        for error in errors:
-            click.echo(f'Config error: {error}', err=True)
-        sys.exit(1)
+    config = _require_config()
 
     async def get_status():
         client = SlackClient(config.slack_user_token)
         repository = Repository()
 
         try:
-            await get_pool()
-            if not await client.authenticate():
-                click.echo('Failed to authenticate with Slack', err=True)
-                sys.exit(1)
+            await _connect(client)
 
             service = StatusService(client, repository)
             result = await service.get_status(hours_back=hours)
@@ -95,6 +105,7 @@ def status(hours: int):
 
         finally:
             await close_pool()
+            await close_http_session()
 
     run_async(get_status())
 
@@ -175,25 +186,16 @@ def _print_status_item(item, color):
 @cli.command()
 def sync():
     """Run a one-time sync of all Slack data."""
-    config = get_config()
-    errors = config.validate()
-    if errors:
-        for error in errors:
-            click.echo(f'Config error: {error}', err=True)
-        sys.exit(1)
+    config = _require_config()
 
     async def run_sync():
         client = SlackClient(config.slack_user_token)
         repository = Repository()
 
         try:
-            await get_pool()
+            await _connect(client)
             logger.info('Connected to database')
 
-            if not await client.authenticate():
-                click.echo('Failed to authenticate with Slack', err=True)
-                sys.exit(1)
-
             poller = SlackPoller(client, repository)
             await poller._sync_channels()
             await poller._sync_all_messages()
@@ -202,6 +204,7 @@ def sync():
 
         finally:
             await close_pool()
+            await close_http_session()
 
     click.echo('Running one-time sync...')
     run_async(run_sync())
@@ -210,33 +213,22 @@ def sync():
 @cli.command()
 def reminders():
     """Sync and display reminders (Later section)."""
-    config = get_config()
-    errors = config.validate()
-    if errors:
-        for error in errors:
-            click.echo(f'Config error: {error}', err=True)
-        sys.exit(1)
+    config = _require_config()
 
     async def sync_reminders():
         client = SlackClient(config.slack_user_token)
         repository = Repository()
 
         try:
-            await get_pool()
-
-            if not await client.authenticate():
-                click.echo('Failed to authenticate with Slack', err=True)
-                sys.exit(1)
+            await _connect(client)
 
             # Fetch reminders from Slack API
             slack_reminders = await client.get_reminders()
             click.echo(f'Found {len(slack_reminders)} reminders from Slack')
 
             # Store in database
-            from slack_assistant.db.models import Reminder
-
-            for r in slack_reminders:
-                reminder = Reminder(
+            to_store = [
+                Reminder(
                     id=r['id'],
                     user_id=r.get('user', client.user_id),
                     text=r.get('text'),
@@ -249,7 +241,9 @@ def reminders():
                         if k not in ('id', 'user', 'text', 'time', 'complete_ts', 'recurring')
                     },
                 )
-                await repository.upsert_reminder(reminder)
+                for r in slack_reminders
+            ]
+            await repository.upsert_reminders_bulk(to_store)
 
             # Display pending reminders
             pending = await repository.get_pending_reminders(client.user_id)
@@ -263,6 +257,7 @@ def reminders():
 
         finally:
             await close_pool()
+            await close_http_session()
 
     run_async(sync_reminders())
 
@@ -273,26 +268,14 @@ def reminders():
 @click.option('--use-slack-api', is_flag=True, help='Also search using Slack API')
 def search(query: str, limit: int, use_slack_api: bool):
     """Search for messages matching the query."""
-    config = get_config()
-    errors = config.validate()
-    if errors:
-        for error in errors:
-            click.echo(f'Config error: {error}', err=True)
-        sys.exit(1)
+    config = _require_config()
 
     async def run_search():
-        from slack_assistant.services.embeddings import EmbeddingService
-        from slack_assistant.services.search import SearchService
-
         client = SlackClient(config.slack_user_token)
         repository = Repository()
 
         try:
-            await get_pool()
-
-            if not await client.authenticate():
-                click.echo('Failed to authenticate with Slack', err=True)
-                sys.exit(1)
+            await _connect(client)
 
             embedding_service = EmbeddingService(repository)
             search_service = SearchService(client, repository, embedding_service)
@@ -325,6 +308,7 @@ def search(query: str, limit: int, use_slack_api: bool):
 
         finally:
             await close_pool()
+            await close_http_session()
 
     run_async(run_search())
 
@@ -334,26 +318,14 @@ def search(query: str, limit: int, use_slack_api: bool):
 @click.option('--limit', default=10, help='Maximum number of related messages (default: 10)')
 def context(message_link: str, limit: int):
     """Find context for a Slack message link."""
-    config = get_config()
-    errors = config.validate()
-    if errors:
-        for error in errors:
-            click.echo(f'Config error: {error}', err=True)
-        sys.exit(1)
+    config = _require_config()
 
     async def find_context():
-        from slack_assistant.services.embeddings import EmbeddingService
-        from slack_assistant.services.search import SearchService
-
         client = SlackClient(config.slack_user_token)
         repository = Repository()
 
         try:
-            await get_pool()
-
-            if not await client.authenticate():
-                click.echo('Failed to authenticate with Slack', err=True)
-                sys.exit(1)
+            await _connect(client)
 
             embedding_service = EmbeddingService(repository)
             search_service = SearchService(client, repository, embedding_service)
@@ -380,6 +352,7 @@ def context(message_link: str, limit: int):
 
         finally:
             await close_pool()
+            await close_http_session()
 
     run_async(find_context())
 
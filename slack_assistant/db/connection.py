@@ -1,36 +1,79 @@
 """Async database connection pool using asyncpg."""
 
+import asyncio
 from contextlib import asynccontextmanager
 from typing import AsyncIterator
 
 import asyncpg
 
 from slack_assistant.config import get_config
+from slack_assistant.db.json_utils import decode_jsonb, encode_jsonb
+from slack_assistant.db.vector_utils import decode_vector, encode_vector
 
 
 _pool: asyncpg.Pool | None = None
+_pool_lock: asyncio.Lock | None = None
+
+
+async def _init_connection(conn: asyncpg.Connection) -> None:
+    """Per-connection setup: JSONB columns map to dicts and pgvector columns to float lists."""
+    # Binary format so the jsonb[] parameters of the unnest batch upserts encode element-wise,
+    # and reads skip the text round-trip (orjson decodes the payload buffer directly)
+    await conn.set_type_codec(
+        'jsonb',
+        encoder=encode_jsonb,
+        decoder=decode_jsonb,
+        schema='pg_catalog',
+        format='binary',
+    )
+    # Embeddings travel as packed float32 rather than a decimal text repr
+    await conn.set_type_codec(
+        'vector',
+        encoder=encode_vector,
+        decoder=decode_vector,
+        schema='public',
+        format='binary',
+    )
 
 
 async def get_pool() -> asyncpg.Pool:
-    """Get or create the database connection pool."""
-    global _pool
-    if _pool is None:
+    """Get or create the database connection pool.
+
+    Concurrent first callers share a single pool creation.
+    """
+    global _pool, _pool_lock
+    if _pool is not None:
+        return _pool
+
+    if _pool_lock is None:
+        _pool_lock = asyncio.Lock()
+
+    async with _pool_lock:
+        if _pool is not None:
+            return _pool
+
         config = get_config()
         _pool = await asyncpg.create_pool(
             config.database_url,
-            min_size=2,
-            max_size=10,
-            command_timeout=60,
+            min_size=config.db_min_size,
+            max_size=config.db_max_size,
+            statement_cache_size=config.db_statement_cache_size,
+            max_inactive_connection_lifetime=config.db_max_inactive_lifetime,
+            command_timeout=config.db_command_timeout,
+            # JIT compilation only costs time on our short OLTP-style queries
+            server_settings={'jit': 'off', 'application_name': 'slack_assistant'},
+            init=_init_connection,
         )
     return _pool
 
 
 async def close_pool() -> None:
     """Close the database connection pool."""
-    global _pool
+    global _pool, _pool_lock
     if _pool is not None:
         await _pool.close()
         _pool = None
+    _pool_lock = None
 
 
 @asynccontextmanager
@@ -0,0 +1,42 @@
+"""JSON helpers for JSONB metadata columns.
+
+Uses orjson when it is installed (several times faster on dict payloads),
+falling back to a reusable stdlib encoder/decoder pair otherwise.
+"""
+
+import json
+from typing import Any
+
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+# Binary JSONB wire format is a version byte followed by the JSON text
+_JSONB_VERSION = b'\x01'
+
+
+if orjson is not None:
+
+    def encode_jsonb(obj: Any) -> bytes:
+        """Encode a value in JSONB binary wire format."""
+        return _JSONB_VERSION + orjson.dumps(obj)
+
+    def decode_jsonb(data: bytes) -> Any:
+        """Decode a value from JSONB binary wire format."""
+        # orjson reads buffers directly, so skip the version byte without copying the payload
+        return orjson.loads(memoryview(data)[1:])
+
+else:
+    # Reused instances; compact separators and no ASCII escaping keep payloads small
+    _encoder = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'))
+    _decoder = json.JSONDecoder()
+
+    def encode_jsonb(obj: Any) -> bytes:
+        """Encode a value in JSONB binary wire format."""
+        return _JSONB_VERSION + _encoder.encode(obj).encode()
+
+    def decode_jsonb(data: bytes) -> Any:
+        """Decode a value from JSONB binary wire format."""
+        return _decoder.decode(data[1:].decode())
@@ -4,12 +4,26 @@ These are dataclasses representing database rows, not ORM models.
 We use raw asyncpg for better async performance.
 """
 
+from collections.abc import Mapping
 from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Any
 
 
-@dataclass
+# Slack message keys stored in dedicated columns rather than metadata
+_SLACK_RESERVED = frozenset({'ts', 'user', 'text', 'thread_ts', 'reply_count', 'type', 'edited'})
+
+
+def without_keys(data: dict[str, Any], reserved: frozenset[str]) -> dict[str, Any]:
+    """Copy a Slack payload without the keys stored in dedicated columns."""
+    # Copying the dict and dropping the few reserved keys is cheaper than rebuilding it key by key
+    metadata = data.copy()
+    for key in reserved:
+        metadata.pop(key, None)
+    return metadata
+
+
+@dataclass(slots=True)
 class Channel:
     """Slack channel/conversation."""
 
@@ -22,7 +36,7 @@ class Channel:
     metadata: dict[str, Any] = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(slots=True)
 class User:
     """Slack user cache."""
 
@@ -35,7 +49,7 @@ class User:
     metadata: dict[str, Any] = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(slots=True)
 class Message:
     """Slack message."""
 
@@ -62,6 +76,25 @@ class Message:
         """Check if message is the parent of a thread."""
         return self.reply_count > 0
 
+    @classmethod
+    def from_row(cls, row: Mapping[str, Any]) -> 'Message':
+        """Create Message from a `messages` table row (metadata is optional)."""
+        # Positional in field order: skips keyword matching for this once-per-row constructor
+        return cls(
+            row['id'],
+            row['channel_id'],
+            row['ts'],
+            row['user_id'],
+            row['text'],
+            row['thread_ts'],
+            row['reply_count'],
+            row['is_edited'],
+            row['message_type'],
+            row['created_at'],
+            row['updated_at'],
+            row.get('metadata') or {},  # Queries that never read metadata may leave it out
+        )
+
     @classmethod
     def from_slack(cls, channel_id: str, msg: dict[str, Any]) -> 'Message':
         """Create Message from Slack API response."""
@@ -84,15 +117,11 @@ class Message:
             is_edited='edited' in msg,
             message_type=msg.get('type', 'message'),
             created_at=created_at,
-            metadata={
-                k: v
-                for k, v in msg.items()
-                if k not in ('ts', 'user', 'text', 'thread_ts', 'reply_count', 'type', 'edited')
-            },
+            metadata=without_keys(msg, _SLACK_RESERVED),
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class Reaction:
     """Reaction on a message."""
 
@@ -103,7 +132,7 @@ class Reaction:
     created_at: datetime | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class MessageEmbedding:
     """Vector embedding for a message."""
 
@@ -114,16 +143,18 @@ class MessageEmbedding:
     created_at: datetime | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class SyncState:
     """Sync state for a channel."""
 
     channel_id: str
     last_ts: str | None = None
     last_sync_at: datetime | None = None
+    # Unfetched backlog left when a poll hit the page limit: [oldest, cursor] ts ranges (both exclusive), newest first
+    catchup_gaps: list[list[str]] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class Reminder:
     """Slack reminder."""
 
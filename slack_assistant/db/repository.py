@@ -1,7 +1,7 @@
 """Database repository for CRUD operations."""
 
-import json
-from datetime import datetime
+from collections.abc import Iterable
+from datetime import UTC, datetime
 from typing import Any
 
 import asyncpg
@@ -10,6 +10,102 @@ from slack_assistant.db.connection import get_connection
 from slack_assistant.db.models import Channel, Message, Reaction, Reminder, SyncState, User
 
 
+_UPSERT_REMINDER_SQL = """
+    INSERT INTO reminders (
+        id, user_id, text, time, complete_ts, recurring,
+        created_at, updated_at, metadata
+    )
+    VALUES ($1, $2, $3, $4, $5, $6, NOW(), NOW(), $7)
+    ON CONFLICT (id) DO UPDATE SET
+        text = EXCLUDED.text,
+        time = EXCLUDED.time,
+        complete_ts = EXCLUDED.complete_ts,
+        recurring = EXCLUDED.recurring,
+        updated_at = NOW(),
+        metadata = EXCLUDED.metadata
+"""
+
+# Rows per batched upsert statement
+_MESSAGE_BATCH_SIZE = 1000
+
+_UPSERT_MESSAGES_BATCH_SQL = """
+    INSERT INTO messages (
+        channel_id, ts, user_id, text, thread_ts, reply_count,
+        is_edited, message_type, created_at, updated_at, metadata
+    )
+    SELECT
+        channel_id, ts, user_id, text, thread_ts, reply_count,
+        is_edited, message_type, created_at, NOW(), metadata
+    FROM unnest(
+        $1::varchar[], $2::varchar[], $3::varchar[], $4::text[], $5::varchar[],
+        $6::int[], $7::bool[], $8::varchar[], $9::timestamptz[], $10::jsonb[]
+    ) AS t(channel_id, ts, user_id, text, thread_ts, reply_count, is_edited, message_type, created_at, metadata)
+    ON CONFLICT (channel_id, ts) DO UPDATE SET
+        user_id = EXCLUDED.user_id,
+        text = EXCLUDED.text,
+        thread_ts = EXCLUDED.thread_ts,
+        reply_count = EXCLUDED.reply_count,
+        is_edited = EXCLUDED.is_edited,
+        updated_at = NOW(),
+        metadata = EXCLUDED.metadata
+    RETURNING id, channel_id, ts
+"""
+
+_REPLACE_REACTIONS_DELETE_SQL = 'DELETE FROM reactions WHERE message_id = ANY($1::int[])'
+_REPLACE_REACTIONS_INSERT_SQL = """
+    INSERT INTO reactions (message_id, name, user_id, created_at)
+    SELECT message_id, name, user_id, NOW()
+    FROM unnest($1::int[], $2::varchar[], $3::varchar[]) AS t(message_id, name, user_id)
+    ON CONFLICT DO NOTHING
+"""
+
+# Status report sections, shared by the single-section getters and the combined attention query.
+# Each takes $1 = user ID and $2 = lower created_at bound and carries its own cap.
+_MENTIONS_SECTION_SQL = """
+    SELECT m.* FROM messages m
+    WHERE m.mentioned_users @> ARRAY[$1::text] AND m.created_at > $2
+    ORDER BY m.created_at DESC
+    LIMIT 50
+"""
+# $1 may be NULL to keep DMs from every sender
+_DMS_SECTION_SQL = """
+    SELECT m.* FROM messages m
+    JOIN channels c ON m.channel_id = c.id
+    WHERE c.channel_type = 'im' AND ($1::varchar IS NULL OR m.user_id IS DISTINCT FROM $1) AND m.created_at > $2
+    ORDER BY m.created_at DESC
+    LIMIT 50
+"""
+_THREADS_SECTION_SQL = """
+    SELECT m.* FROM user_thread_participation utp
+    JOIN messages m ON m.channel_id = utp.channel_id
+        AND (m.ts = utp.thread_ts OR m.thread_ts = utp.thread_ts)
+    WHERE utp.user_id = $1 AND m.user_id != $1 AND m.created_at > $2
+    ORDER BY m.created_at DESC
+    LIMIT 100
+"""
+
+# All three sections tagged by priority, with names joined once for all of them
+_ATTENTION_ITEMS_SQL = f"""
+    SELECT
+        items.*,
+        c.name AS channel_name,
+        COALESCE(NULLIF(u.display_name, ''), u.name) AS user_name
+    FROM (
+        SELECT 1 AS priority, s.* FROM ({_MENTIONS_SECTION_SQL}) s
+        UNION ALL
+        SELECT 2 AS priority, s.* FROM ({_DMS_SECTION_SQL}) s
+        UNION ALL
+        SELECT 3 AS priority, s.* FROM ({_THREADS_SECTION_SQL}) s
+    ) items
+    LEFT JOIN channels c ON items.channel_id = c.id
+    LEFT JOIN users u ON items.user_id = u.id
+    ORDER BY items.priority, items.created_at DESC
+"""
+
+# Lower bound for section queries called without `since`; keeps the created_at filter index-friendly
+_BEGINNING_OF_TIME = datetime.min.replace(tzinfo=UTC)
+
+
 class Repository:
     """Database repository for Slack Assistant."""
 
@@ -34,41 +130,32 @@ class Repository:
                 channel.channel_type,
                 channel.is_archived,
                 channel.created_at,
-                json.dumps(channel.metadata),
+                channel.metadata,
             )
 
     async def get_channel(self, channel_id: str) -> Channel | None:
         """Get a channel by ID."""
         async with get_connection() as conn:
             row = await conn.fetchrow('SELECT * FROM channels WHERE id = $1', channel_id)
-            if row:
-                return Channel(
-                    id=row['id'],
-                    name=row['name'],
-                    channel_type=row['channel_type'],
-                    is_archived=row['is_archived'],
-                    created_at=row['created_at'],
-                    updated_at=row['updated_at'],
-                    metadata=json.loads(row['metadata']) if row['metadata'] else {},
-                )
-            return None
+            return self._row_to_channel(row) if row else None
 
     async def get_all_channels(self) -> list[Channel]:
         """Get all channels."""
         async with get_connection() as conn:
             rows = await conn.fetch('SELECT * FROM channels WHERE is_archived = FALSE')
-            return [
-                Channel(
-                    id=row['id'],
-                    name=row['name'],
-                    channel_type=row['channel_type'],
-                    is_archived=row['is_archived'],
-                    created_at=row['created_at'],
-                    updated_at=row['updated_at'],
-                    metadata=json.loads(row['metadata']) if row['metadata'] else {},
-                )
-                for row in rows
-            ]
+            return [self._row_to_channel(row) for row in rows]
+
+    def _row_to_channel(self, row: asyncpg.Record) -> Channel:
+        """Convert a database row to a Channel object."""
+        return Channel(
+            id=row['id'],
+            name=row['name'],
+            channel_type=row['channel_type'],
+            is_archived=row['is_archived'],
+            created_at=row['created_at'],
+            updated_at=row['updated_at'],
+            metadata=row['metadata'] or {},
+        )
 
     # User operations
 
@@ -92,24 +179,32 @@ class Repository:
                 user.real_name,
                 user.display_name,
                 user.is_bot,
-                json.dumps(user.metadata),
+                user.metadata,
             )
 
     async def get_user(self, user_id: str) -> User | None:
         """Get a user by ID."""
         async with get_connection() as conn:
             row = await conn.fetchrow('SELECT * FROM users WHERE id = $1', user_id)
-            if row:
-                return User(
-                    id=row['id'],
-                    name=row['name'],
-                    real_name=row['real_name'],
-                    display_name=row['display_name'],
-                    is_bot=row['is_bot'],
-                    updated_at=row['updated_at'],
-                    metadata=json.loads(row['metadata']) if row['metadata'] else {},
-                )
-            return None
+            return self._row_to_user(row) if row else None
+
+    async def get_existing_user_ids(self, user_ids: Iterable[str]) -> set[str]:
+        """Return which of the given user IDs are stored, in one query that reads only the key."""
+        async with get_connection() as conn:
+            rows = await conn.fetch('SELECT id FROM users WHERE id = ANY($1::varchar[])', list(user_ids))
+        return {row[0] for row in rows}
+
+    def _row_to_user(self, row: asyncpg.Record) -> User:
+        """Convert a database row to a User object."""
+        return User(
+            id=row['id'],
+            name=row['name'],
+            real_name=row['real_name'],
+            display_name=row['display_name'],
+            is_bot=row['is_bot'],
+            updated_at=row['updated_at'],
+            metadata=row['metadata'] or {},
+        )
 
     # Message operations
 
@@ -142,7 +237,7 @@ class Repository:
                 message.is_edited,
                 message.message_type,
                 message.created_at,
-                json.dumps(message.metadata),
+                message.metadata,
             )
             return row['id']
 
@@ -213,47 +308,98 @@ class Repository:
             )
             return [self._row_to_message(row) for row in rows]
 
+    async def upsert_messages_with_reactions(
+        self, messages: list[Message], reactions: dict[tuple[str, str], list[dict[str, Any]]]
+    ) -> dict[tuple[str, str], int]:
+        """Upsert messages and replace their reactions in one transaction.
+
+        reactions maps (channel_id, ts) to the Slack reaction list for that message;
+        messages without an entry keep their stored reactions. Returns IDs keyed by (channel_id, ts).
+        """
+        async with get_connection() as conn:
+            async with conn.transaction():
+                ids = await self._upsert_messages_batch(conn, messages)
+                await self._replace_reactions(conn, {ids[key]: value for key, value in reactions.items()})
+        return ids
+
+    async def _upsert_messages_batch(
+        self, conn: asyncpg.Connection, messages: list[Message]
+    ) -> dict[tuple[str, str], int]:
+        """Upsert messages on an open connection, returning IDs keyed by (channel_id, ts).
+
+        Each statement carries up to 1000 rows, so N messages cost ~N/1000 round-trips
+        instead of N. Rows are passed as column arrays and expanded with unnest(), so the
+        SQL text is identical for every batch size and its prepared statement is reused.
+        """
+        # ON CONFLICT can't touch the same row twice in one statement; keep the last copy
+        unique = list({(m.channel_id, m.ts): m for m in messages}.values())
+        ids: dict[tuple[str, str], int] = {}
+
+        for start in range(0, len(unique), _MESSAGE_BATCH_SIZE):
+            batch = unique[start : start + _MESSAGE_BATCH_SIZE]
+            rows = await conn.fetch(
+                _UPSERT_MESSAGES_BATCH_SQL,
+                [m.channel_id for m in batch],
+                [m.ts for m in batch],
+                [m.user_id for m in batch],
+                [m.text for m in batch],
+                [m.thread_ts for m in batch],
+                [m.reply_count for m in batch],
+                [m.is_edited for m in batch],
+                [m.message_type for m in batch],
+                [m.created_at for m in batch],
+                [m.metadata for m in batch],
+            )
+            ids.update({(row['channel_id'], row['ts']): row['id'] for row in rows})
+
+        return ids
+
     def _row_to_message(self, row: asyncpg.Record) -> Message:
         """Convert a database row to a Message object."""
-        return Message(
-            id=row['id'],
-            channel_id=row['channel_id'],
-            ts=row['ts'],
-            user_id=row['user_id'],
-            text=row['text'],
-            thread_ts=row['thread_ts'],
-            reply_count=row['reply_count'],
-            is_edited=row['is_edited'],
-            message_type=row['message_type'],
-            created_at=row['created_at'],
-            updated_at=row['updated_at'],
-            metadata=json.loads(row['metadata']) if row['metadata'] else {},
-        )
+        return Message.from_row(row)
 
     # Reaction operations
 
     async def upsert_reactions(self, message_id: int, reactions: list[dict[str, Any]]) -> None:
         """Update reactions for a message (replace all)."""
+        rows = [
+            (message_id, reaction.get('name', ''), user_id)
+            for reaction in reactions
+            for user_id in reaction.get('users', [])
+        ]
+
         async with get_connection() as conn:
-            # Delete existing reactions
-            await conn.execute('DELETE FROM reactions WHERE message_id = $1', message_id)
-
-            # Insert new reactions
-            for reaction in reactions:
-                name = reaction.get('name', '')
-                users = reaction.get('users', [])
-                for user_id in users:
-                    await conn.execute(
+            # Replace atomically so readers never see the message without reactions
+            async with conn.transaction():
+                await conn.execute('DELETE FROM reactions WHERE message_id = $1', message_id)
+                if rows:
+                    await conn.executemany(
                         """
                         INSERT INTO reactions (message_id, name, user_id, created_at)
                         VALUES ($1, $2, $3, NOW())
                         ON CONFLICT DO NOTHING
                         """,
-                        message_id,
-                        name,
-                        user_id,
+                        rows,
                     )
 
+    async def _replace_reactions(
+        self, conn: asyncpg.Connection, reactions_by_message: dict[int, list[dict[str, Any]]]
+    ) -> None:
+        """Replace reactions for the given messages on an open connection."""
+        if not reactions_by_message:
+            return
+
+        rows = [
+            (message_id, reaction.get('name', ''), user_id)
+            for message_id, reactions in reactions_by_message.items()
+            for reaction in reactions
+            for user_id in reaction.get('users', [])
+        ]
+        await conn.execute(_REPLACE_REACTIONS_DELETE_SQL, list(reactions_by_message))
+        if rows:
+            message_ids, names, user_ids = zip(*rows)
+            await conn.execute(_REPLACE_REACTIONS_INSERT_SQL, list(message_ids), list(names), list(user_ids))
+
     async def get_reactions(self, message_id: int) -> list[Reaction]:
         """Get reactions for a message."""
         async with get_connection() as conn:
@@ -286,6 +432,7 @@ class Repository:
                     channel_id=row['channel_id'],
                     last_ts=row['last_ts'],
                     last_sync_at=row['last_sync_at'],
+                    catchup_gaps=row['catchup_gaps'],
                 )
             return None
 
@@ -294,14 +441,16 @@ class Repository:
         async with get_connection() as conn:
             await conn.execute(
                 """
-                INSERT INTO sync_state (channel_id, last_ts, last_sync_at)
-                VALUES ($1, $2, NOW())
+                INSERT INTO sync_state (channel_id, last_ts, catchup_gaps, last_sync_at)
+                VALUES ($1, $2, $3, NOW())
                 ON CONFLICT (channel_id) DO UPDATE SET
                     last_ts = EXCLUDED.last_ts,
+                    catchup_gaps = EXCLUDED.catchup_gaps,
                     last_sync_at = NOW()
                 """,
                 sync_state.channel_id,
                 sync_state.last_ts,
+                sync_state.catchup_gaps,
             )
 
     # Reminder operations
@@ -309,32 +458,35 @@ class Repository:
     async def upsert_reminder(self, reminder: Reminder) -> None:
         """Insert or update a reminder."""
         async with get_connection() as conn:
-            await conn.execute(
-                """
-                INSERT INTO reminders (
-                    id, user_id, text, time, complete_ts, recurring,
-                    created_at, updated_at, metadata
-                )
-                VALUES ($1, $2, $3, $4, $5, $6, NOW(), NOW(), $7)
-                ON CONFLICT (id) DO UPDATE SET
-                    text = EXCLUDED.text,
-                    time = EXCLUDED.time,
-                    complete_ts = EXCLUDED.complete_ts,
-                    recurring = EXCLUDED.recurring,
-                    updated_at = NOW(),
-                    metadata = EXCLUDED.metadata
-                """,
-                reminder.id,
-                reminder.user_id,
-                reminder.text,
-                reminder.time,
-                reminder.complete_ts,
-                reminder.recurring,
-                json.dumps(reminder.metadata),
-            )
+            await conn.execute(_UPSERT_REMINDER_SQL, *self._reminder_params(reminder))
+
+    async def upsert_reminders_bulk(self, reminders: list[Reminder]) -> None:
+        """Insert or update many reminders in a single round-trip."""
+        if not reminders:
+            return
+        async with get_connection() as conn:
+            async with conn.transaction():
+                await conn.executemany(_UPSERT_REMINDER_SQL, [self._reminder_params(r) for r in reminders])
+
+    @staticmethod
+    def _reminder_params(reminder: Reminder) -> tuple[Any, ...]:
+        """Positional parameters for the reminder upsert statement."""
+        return (
+            reminder.id,
+            reminder.user_id,
+            reminder.text,
+            reminder.time,
+            reminder.complete_ts,
+            reminder.recurring,
+            reminder.metadata,
+        )
 
     async def get_pending_reminders(self, user_id: str) -> list[Reminder]:
-        """Get pending (incomplete) reminders for a user."""
+        """Get pending (incomplete) reminders for a user.
+
+        Served by the partial index idx_reminders_pending, which holds only pending rows
+        already ordered by time.
+        """
         async with get_connection() as conn:
             rows = await conn.fetch(
                 """
@@ -354,7 +506,7 @@ class Repository:
                     recurring=row['recurring'],
                     created_at=row['created_at'],
                     updated_at=row['updated_at'],
-                    metadata=json.loads(row['metadata']) if row['metadata'] else {},
+                    metadata=row['metadata'] or {},
                 )
                 for row in rows
             ]
@@ -364,63 +516,41 @@ class Repository:
     async def get_unread_mentions(self, user_id: str, since: datetime | None = None) -> list[Message]:
         """Get messages that mention a user."""
         async with get_connection() as conn:
-            query = """
-                SELECT m.* FROM messages m
-                WHERE m.text LIKE $1
-            """
-            params: list[Any] = [f'%<@{user_id}>%']
-
-            if since:
-                query += ' AND m.created_at > $2'
-                params.append(since)
-
-            query += ' ORDER BY m.created_at DESC LIMIT 50'
-
-            rows = await conn.fetch(query, *params)
-            return [self._row_to_message(row) for row in rows]
+            rows = await conn.fetch(_MENTIONS_SECTION_SQL, user_id, since or _BEGINNING_OF_TIME)
+        return [self._row_to_message(row) for row in rows]
 
-    async def get_dm_messages(self, since: datetime | None = None) -> list[Message]:
-        """Get recent DM messages."""
+    async def get_dm_messages(self, since: datetime | None = None, exclude_user_id: str | None = None) -> list[Message]:
+        """Get recent DM messages, optionally skipping those sent by `exclude_user_id`."""
         async with get_connection() as conn:
-            query = """
-                SELECT m.* FROM messages m
-                JOIN channels c ON m.channel_id = c.id
-                WHERE c.channel_type = 'im'
-            """
-            params: list[Any] = []
+            rows = await conn.fetch(_DMS_SECTION_SQL, exclude_user_id, since or _BEGINNING_OF_TIME)
+        return [self._row_to_message(row) for row in rows]
 
-            if since:
-                query += ' AND m.created_at > $1'
-                params.append(since)
-
-            query += ' ORDER BY m.created_at DESC LIMIT 50'
+    async def get_threads_with_replies(
+        self, user_id: str, since: datetime | None = None
+    ) -> list[tuple[Message, str | None]]:
+        """Get threads where user participated that have new replies, as (message, channel_name) pairs."""
+        async with get_connection() as conn:
+            rows = await conn.fetch(
+                f"""
+                SELECT t.*, c.name AS channel_name
+                FROM ({_THREADS_SECTION_SQL}) t
+                JOIN channels c ON t.channel_id = c.id
+                ORDER BY t.created_at DESC
+                """,
+                user_id,
+                since or _BEGINNING_OF_TIME,
+            )
+        return [(self._row_to_message(row), row['channel_name']) for row in rows]
 
-            rows = await conn.fetch(query, *params)
-            return [self._row_to_message(row) for row in rows]
+    async def get_attention_items(
+        self, user_id: str, since: datetime
+    ) -> list[tuple[int, Message, str | None, str | None]]:
+        """Get mentions, DMs and thread replies needing attention in one round-trip.
 
-    async def get_threads_with_replies(self, user_id: str, since: datetime | None = None) -> list[dict[str, Any]]:
-        """Get threads where user participated that have new replies."""
+        Returns (priority, message, channel_name, user_name) tuples ordered by priority
+        (1 mention, 2 DM, 3 thread reply) then newest first. The sections are the same SQL
+        as get_unread_mentions, get_dm_messages and get_threads_with_replies.
+        """
         async with get_connection() as conn:
-            query = """
-                WITH user_threads AS (
-                    SELECT DISTINCT channel_id, COALESCE(thread_ts, ts) as thread_ts
-                    FROM messages
-                    WHERE user_id = $1
-                )
-                SELECT m.*, c.name as channel_name
-                FROM messages m
-                JOIN user_threads ut ON m.channel_id = ut.channel_id
-                    AND (m.ts = ut.thread_ts OR m.thread_ts = ut.thread_ts)
-                JOIN channels c ON m.channel_id = c.id
-                WHERE m.user_id != $1
-            """
-            params: list[Any] = [user_id]
-
-            if since:
-                query += ' AND m.created_at > $2'
-                params.append(since)
-
-            query += ' ORDER BY m.created_at DESC LIMIT 100'
-
-            rows = await conn.fetch(query, *params)
-            return [dict(row) for row in rows]
+            rows = await conn.fetch(_ATTENTION_ITEMS_SQL, user_id, since)
+        return [(row['priority'], self._row_to_message(row), row['channel_name'], row['user_name']) for row in rows]
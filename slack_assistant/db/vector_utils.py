@@ -0,0 +1,33 @@
+"""Binary codec helpers for pgvector `vector` columns.
+
+The wire format is a big-endian int16 dimension count, an unused int16,
+then the dimension count of big-endian float32 values. Packing through
+array('f') avoids building one Python float per component in asyncpg's
+text path and sends 4 bytes per value instead of its decimal repr.
+"""
+
+import struct
+import sys
+from array import array
+from collections.abc import Sequence
+
+
+_HEADER = struct.Struct('>HH')
+_SWAP = sys.byteorder == 'little'
+
+
+def encode_vector(values: Sequence[float]) -> bytes:
+    """Encode a sequence of floats in pgvector binary wire format."""
+    floats = array('f', values)
+    if _SWAP:
+        floats.byteswap()
+    return _HEADER.pack(len(floats), 0) + floats.tobytes()
+
+
+def decode_vector(data: bytes) -> list[float]:
+    """Decode pgvector binary wire format into a list of floats."""
+    floats = array('f')
+    floats.frombytes(data[_HEADER.size :])
+    if _SWAP:
+        floats.byteswap()
+    return floats.tolist()
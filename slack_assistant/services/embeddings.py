@@ -1,8 +1,11 @@
 """Embedding generation service for vector search."""
 
+import asyncio
 import logging
 from typing import Any
 
+import asyncpg
+
 from slack_assistant.config import get_config
 from slack_assistant.db.connection import get_connection
 from slack_assistant.db.repository import Repository
@@ -10,6 +13,22 @@ from slack_assistant.db.repository import Repository
 
 logger = logging.getLogger(__name__)
 
+# Messages per backfill batch; each batch is stored with one executemany
+_BACKFILL_BATCH_SIZE = 256
+# Batches embedded and written concurrently; each holds a pooled connection while writing
+_BACKFILL_CONCURRENCY = 8
+# Embedding API requests in flight at once, shared by all backfill batches
+_EMBED_REQUEST_CONCURRENCY = 16
+
+_UPSERT_EMBEDDING_SQL = """
+    INSERT INTO message_embeddings (message_id, embedding, model, created_at)
+    VALUES ($1, $2, $3, NOW())
+    ON CONFLICT (message_id) DO UPDATE SET
+        embedding = EXCLUDED.embedding,
+        model = EXCLUDED.model,
+        created_at = NOW()
+"""
+
 
 class EmbeddingService:
     """Service for generating and storing message embeddings."""
@@ -50,25 +69,14 @@ class EmbeddingService:
             return False
 
         async with get_connection() as conn:
-            await conn.execute(
-                """
-                INSERT INTO message_embeddings (message_id, embedding, model, created_at)
-                VALUES ($1, $2, $3, NOW())
-                ON CONFLICT (message_id) DO UPDATE SET
-                    embedding = EXCLUDED.embedding,
-                    model = EXCLUDED.model,
-                    created_at = NOW()
-                """,
-                message_id,
-                embedding,
-                self.model,
-            )
+            await conn.execute(_UPSERT_EMBEDDING_SQL, message_id, embedding, self.model)
         return True
 
     async def backfill_embeddings(self, limit: int = 100) -> int:
         """Generate embeddings for messages that don't have them yet."""
+        # Read the candidates up front and release the connection: embedding calls are slow, and
+        # holding it (plus an open transaction) across them would pin it and starve the batch writers
         async with get_connection() as conn:
-            # Find messages without embeddings
             rows = await conn.fetch(
                 """
                 SELECT m.id, m.text
@@ -81,20 +89,73 @@ class EmbeddingService:
                 limit,
             )
 
+        # API-sized batches embedded and written several at a time, each write with one executemany
+        semaphore = asyncio.Semaphore(_BACKFILL_CONCURRENCY)
+        requests = asyncio.Semaphore(_EMBED_REQUEST_CONCURRENCY)
+        results = await asyncio.gather(
+            *(
+                self._embed_batch(rows[start : start + _BACKFILL_BATCH_SIZE], semaphore, requests)
+                for start in range(0, len(rows), _BACKFILL_BATCH_SIZE)
+            ),
+            return_exceptions=True,
+        )
+
         embedded_count = 0
-        for row in rows:
-            if await self.embed_message(row['id'], row['text']):
-                embedded_count += 1
+        for result in results:
+            if isinstance(result, BaseException):
+                logger.error(f'Embedding batch failed: {result}')
+            else:
+                embedded_count += result
 
         logger.info(f'Generated embeddings for {embedded_count}/{len(rows)} messages')
         return embedded_count
 
-    async def get_embedding_stats(self) -> dict[str, Any]:
-        """Get statistics about embeddings."""
+    async def _embed_batch(
+        self, rows: list[asyncpg.Record], semaphore: asyncio.Semaphore, requests: asyncio.Semaphore
+    ) -> int:
+        """Embed a batch of (id, text) rows and store the results."""
+        async with semaphore:
+            embeddings = await asyncio.gather(*(self._generate_bounded(row['text'], requests) for row in rows))
+            records = [
+                (row['id'], embedding, self.model)
+                for row, embedding in zip(rows, embeddings, strict=True)
+                if embedding is not None
+            ]
+            if records:
+                async with get_connection() as conn:
+                    await conn.executemany(_UPSERT_EMBEDDING_SQL, records)
+            return len(records)
+
+    async def _generate_bounded(self, text: str, requests: asyncio.Semaphore) -> list[float] | None:
+        """Generate an embedding while holding one of the shared request slots."""
+        async with requests:
+            return await self.generate_embedding(text)
+
+    async def get_embedding_stats(self, approximate: bool = False) -> dict[str, Any]:
+        """Get statistics about embeddings.
+
+        With approximate=True, counts come from planner statistics (pg_class.reltuples)
+        instead of full scans, which is far cheaper on large tables but only as fresh
+        as the last VACUUM/ANALYZE.
+        """
+        if approximate:
+            query = """
+                SELECT
+                    GREATEST((SELECT reltuples FROM pg_class WHERE oid = 'messages'::regclass), 0)::bigint AS total,
+                    GREATEST((SELECT reltuples FROM pg_class WHERE oid = 'message_embeddings'::regclass), 0)::bigint
+                        AS embedded
+            """
+        else:
+            query = """
+                SELECT
+                    (SELECT COUNT(*) FROM messages) AS total,
+                    (SELECT COUNT(*) FROM message_embeddings) AS embedded
+            """
         async with get_connection() as conn:
-            total_messages = await conn.fetchval('SELECT COUNT(*) FROM messages')
-            embedded_messages = await conn.fetchval('SELECT COUNT(*) FROM message_embeddings')
+            row = await conn.fetchrow(query)
 
+        total_messages = row['total']
+        embedded_messages = row['embedded']
         return {
             'total_messages': total_messages,
             'embedded_messages': embedded_messages,
@@ -1,5 +1,7 @@
 """Search service for finding relevant messages."""
 
+import asyncio
+import heapq
 import logging
 import re
 from dataclasses import dataclass
@@ -15,8 +17,68 @@ from slack_assistant.slack.client import SlackClient
 
 logger = logging.getLogger(__name__)
 
-
-@dataclass
+# Slack message links, in either form:
+#   https://workspace.slack.com/archives/CHANNEL_ID/pTIMESTAMP
+#   slack://channel?id=CHANNEL_ID&message=TIMESTAMP (parameters in any order)
+# Schemes are case-insensitive, as urlparse treats them
+_MESSAGE_LINK_RE = re.compile(
+    r'(?:(?i:[a-z]+)://[^/]*)?/archives/(?P<channel>[^/?#]+)/p(?P<digits>\d{7,})'
+    r'|(?i:slack)://channel\?(?=(?:.*&)?id=(?P<slack_channel>[^&#]+))(?=(?:.*&)?message=(?P<slack_ts>[^&#]+))'
+)
+
+# Below this limit a plain fetch is cheaper than the transaction a server-side cursor needs
+_STREAM_MIN_LIMIT = 200
+_STREAM_PREFETCH = 64
+
+# Top-N nearest embeddings and top-N full-text matches, merged by message id.
+# metadata is left out: search results never read it, so it isn't sent or decoded.
+# Columns are read by position in SearchService._hybrid_row_to_result; keep the order in sync.
+# Kept as one fixed text (optional halves are NULL parameters) so asyncpg's per-connection
+# statement cache (DB_STATEMENT_CACHE_SIZE) parses and plans it once per pooled connection.
+_HYBRID_SEARCH_SQL = """
+    WITH v AS (
+        -- Order by the selected distance so it is computed once per row (and stays index-orderable)
+        SELECT id, 1 - distance AS similarity
+        FROM (
+            SELECT me.message_id AS id, me.embedding <=> $1::vector AS distance
+            FROM message_embeddings me
+            WHERE $1::vector IS NOT NULL
+            ORDER BY distance
+            LIMIT $3
+        ) nearest
+    ),
+    t AS (
+        -- Rank scaled by the best match so text scores span 0..1 like vector similarity
+        SELECT id, rank / NULLIF(max(rank) OVER (), 0) AS text_rank
+        FROM (
+            -- Full-text match served by idx_messages_text_fts
+            SELECT id, ts_rank_cd(to_tsvector('simple', text), plainto_tsquery('simple', $2)) AS rank
+            FROM messages
+            WHERE $2::text IS NOT NULL AND to_tsvector('simple', text) @@ plainto_tsquery('simple', $2)
+            ORDER BY rank DESC, created_at DESC
+            LIMIT $3
+        ) matched
+    ),
+    hits AS (
+        SELECT id, v.similarity, t.text_rank
+        FROM v FULL JOIN t USING (id)
+    )
+    SELECT
+        m.id, m.channel_id, m.ts, m.user_id, m.text, m.thread_ts, m.reply_count,
+        m.is_edited, m.message_type, m.created_at, m.updated_at,
+        c.name as channel_name,
+        u.display_name as user_name,
+        hits.similarity,
+        hits.text_rank
+    FROM hits
+    JOIN messages m ON m.id = hits.id
+    LEFT JOIN channels c ON m.channel_id = c.id
+    LEFT JOIN users u ON m.user_id = u.id
+    ORDER BY GREATEST(hits.similarity, hits.text_rank) DESC, m.created_at DESC
+"""
+
+
+@dataclass(slots=True)
 class SearchResult:
     """A search result with relevance score."""
 
@@ -61,124 +123,89 @@ class SearchService:
         Returns:
             List of search results sorted by relevance
         """
+        # Vector and text search share one query; the Slack API search runs alongside it
+        searches = []
+        vector = use_vector and self.embedding_service is not None
+        if vector or use_text:
+            searches.append(self._hybrid_search(query, limit, use_vector=vector, use_text=use_text))
+        if use_slack_api:
+            searches.append(self._slack_api_search(query, limit))
+
         results: list[SearchResult] = []
+        for outcome in await asyncio.gather(*searches, return_exceptions=True):
+            if isinstance(outcome, BaseException):
+                logger.error(f'Search failed: {outcome}')
+            else:
+                results.extend(outcome)
+
+        # Keep the best-scoring result per message, then take the top `limit`
+        best: dict[tuple[str, str], SearchResult] = {}
+        for result in results:
+            key = (result.message.channel_id, result.message.ts)
+            current = best.get(key)
+            if current is None or result.score > current.score:
+                best[key] = result
+
+        return heapq.nlargest(limit, best.values(), key=lambda r: r.score)
+
+    async def _hybrid_search(
+        self,
+        query: str,
+        limit: int,
+        use_vector: bool = True,
+        use_text: bool = True,
+    ) -> list[SearchResult]:
+        """Search by vector similarity and text match in a single round-trip.
 
-        # Vector search
+        The top `limit` nearest embeddings and the `limit` best full-text matches are
+        merged in SQL; each message is scored by whichever match ranks it higher.
+        """
+        query_embedding = None
         if use_vector and self.embedding_service:
-            vector_results = await self._vector_search(query, limit)
-            results.extend(vector_results)
-
-        # Text search
-        if use_text:
-            text_results = await self._text_search(query, limit)
-            results.extend(text_results)
-
-        # Slack API search
-        if use_slack_api:
-            api_results = await self._slack_api_search(query, limit)
-            results.extend(api_results)
-
-        # Deduplicate and sort by score
-        seen = set()
-        unique_results = []
-        for result in sorted(results, key=lambda r: r.score, reverse=True):
-            key = f'{result.message.channel_id}:{result.message.ts}'
-            if key not in seen:
-                seen.add(key)
-                unique_results.append(result)
-
-        return unique_results[:limit]
-
-    async def _vector_search(self, query: str, limit: int) -> list[SearchResult]:
-        """Search using vector similarity."""
-        if not self.embedding_service:
-            return []
+            query_embedding = await self.embedding_service.generate_embedding(query)
+            if query_embedding is None:
+                logger.warning('Could not generate query embedding')
 
-        # Generate embedding for query
-        query_embedding = await self.embedding_service.generate_embedding(query)
-        if query_embedding is None:
-            logger.warning('Could not generate query embedding')
+        text_query = query if use_text else None
+        if query_embedding is None and text_query is None:
             return []
 
+        params = (query_embedding, text_query, limit)
         async with get_connection() as conn:
-            # Use cosine similarity for vector search
-            rows = await conn.fetch(
-                """
-                SELECT
-                    m.*,
-                    c.name as channel_name,
-                    u.display_name as user_name,
-                    1 - (me.embedding <=> $1::vector) as similarity
-                FROM message_embeddings me
-                JOIN messages m ON me.message_id = m.id
-                LEFT JOIN channels c ON m.channel_id = c.id
-                LEFT JOIN users u ON m.user_id = u.id
-                ORDER BY me.embedding <=> $1::vector
-                LIMIT $2
-                """,
-                query_embedding,
-                limit,
-            )
-
-        results = []
-        for row in rows:
-            message = self._row_to_message(row)
-            results.append(
-                SearchResult(
-                    message=message,
-                    channel_name=row['channel_name'],
-                    user_name=row['user_name'],
-                    score=float(row['similarity']),
-                    link=self.client.get_message_link(message.channel_id, message.ts, message.thread_ts),
-                    match_type='vector',
-                )
-            )
-
-        return results
-
-    async def _text_search(self, query: str, limit: int) -> list[SearchResult]:
-        """Search using text matching."""
-        # Simple ILIKE search - could be improved with full-text search
-        search_pattern = f'%{query}%'
-
-        async with get_connection() as conn:
-            rows = await conn.fetch(
-                """
-                SELECT
-                    m.*,
-                    c.name as channel_name,
-                    u.display_name as user_name
-                FROM messages m
-                LEFT JOIN channels c ON m.channel_id = c.id
-                LEFT JOIN users u ON m.user_id = u.id
-                WHERE m.text ILIKE $1
-                ORDER BY m.created_at DESC
-                LIMIT $2
-                """,
-                search_pattern,
-                limit,
-            )
-
-        results = []
-        for row in rows:
-            message = self._row_to_message(row)
-            # Simple relevance score based on match position
-            text = message.text or ''
-            match = re.search(re.escape(query), text, re.IGNORECASE)
-            score = 1.0 - (match.start() / len(text)) if match and text else 0.5
-
-            results.append(
-                SearchResult(
-                    message=message,
-                    channel_name=row['channel_name'],
-                    user_name=row['user_name'],
-                    score=score,
-                    link=self.client.get_message_link(message.channel_id, message.ts, message.thread_ts),
-                    match_type='text',
-                )
-            )
-
-        return results
+            if limit <= _STREAM_MIN_LIMIT:
+                rows = await conn.fetch(_HYBRID_SEARCH_SQL, *params)
+                return [self._hybrid_row_to_result(row) for row in rows]
+
+            # Large result sets: build results as rows arrive instead of holding every Record first
+            results = []
+            async with conn.transaction():
+                async for row in conn.cursor(_HYBRID_SEARCH_SQL, *params, prefetch=_STREAM_PREFETCH):
+                    results.append(self._hybrid_row_to_result(row))
+            return results
+
+    def _hybrid_row_to_result(self, row: Any) -> SearchResult:
+        """Score a hybrid search row by whichever of its matches ranks higher."""
+        # Unpacked by position, which skips a name lookup per column; relies on the
+        # SELECT list of _HYBRID_SEARCH_SQL matching Message's field order up to updated_at
+        *message_fields, channel_name, user_name, similarity, text_rank = row
+        message = Message(*message_fields)
+
+        score = -1.0
+        match_type = 'vector'
+        if similarity is not None:
+            score = float(similarity)
+        if text_rank is not None and text_rank > score:
+            score = float(text_rank)
+            match_type = 'text'
+
+        return SearchResult(
+            message=message,
+            channel_name=channel_name,
+            user_name=user_name,
+            score=score,
+            link=self.client.get_message_link(message.channel_id, message.ts, message.thread_ts),
+            match_type=match_type,
+        )
 
     async def _slack_api_search(self, query: str, limit: int) -> list[SearchResult]:
         """Search using Slack's search API."""
@@ -222,32 +249,17 @@ class SearchService:
         Returns:
             List of related messages
         """
-        # Parse message link to extract channel_id and ts
-        # Format: https://workspace.slack.com/archives/CHANNEL_ID/pTIMESTAMP
-        # or: slack://channel?id=CHANNEL_ID&message=TIMESTAMP
-        import urllib.parse
-
-        parsed = urllib.parse.urlparse(message_link)
-
+        match = _MESSAGE_LINK_RE.match(message_link)
         channel_id = None
         message_ts = None
-
-        if 'slack.com' in parsed.netloc or parsed.path.startswith('/archives/'):
-            # Web URL format
-            parts = parsed.path.strip('/').split('/')
-            if len(parts) >= 2 and parts[0] == 'archives':
-                channel_id = parts[1]
-                if len(parts) >= 3:
-                    # Convert pTIMESTAMP to TIMESTAMP.XXXXXX format
-                    ts_part = parts[2]
-                    if ts_part.startswith('p'):
-                        ts_digits = ts_part[1:]
-                        message_ts = f'{ts_digits[:-6]}.{ts_digits[-6:]}'
-        elif parsed.scheme == 'slack':
-            # Slack URL scheme
-            params = urllib.parse.parse_qs(parsed.query)
-            channel_id = params.get('id', [None])[0]
-            message_ts = params.get('message', [None])[0]
+        if match:
+            if digits := match['digits']:
+                # Convert pTIMESTAMP to TIMESTAMP.XXXXXX format
+                channel_id = match['channel']
+                message_ts = f'{digits[:-6]}.{digits[-6:]}'
+            else:
+                channel_id = match['slack_channel']
+                message_ts = match['slack_ts']
 
         if not channel_id or not message_ts:
             logger.warning(f'Could not parse message link: {message_link}')
@@ -264,22 +276,3 @@ class SearchService:
             return await self.search(source_message.text, limit=limit, use_slack_api=False)
 
         return []
-
-    def _row_to_message(self, row: Any) -> Message:
-        """Convert a database row to a Message object."""
-        import json
-
-        return Message(
-            id=row['id'],
-            channel_id=row['channel_id'],
-            ts=row['ts'],
-            user_id=row['user_id'],
-            text=row['text'],
-            thread_ts=row['thread_ts'],
-            reply_count=row['reply_count'],
-            is_edited=row['is_edited'],
-            message_type=row['message_type'],
-            created_at=row['created_at'],
-            updated_at=row['updated_at'],
-            metadata=json.loads(row['metadata']) if row['metadata'] else {},
-        )
@@ -1,11 +1,14 @@
 """Status service for generating attention-needed items."""
 
+import asyncio
 import logging
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from enum import Enum
+from operator import itemgetter
 from typing import Any
 
+from slack_assistant.db.models import Message
 from slack_assistant.db.repository import Repository
 from slack_assistant.slack.client import SlackClient
 
@@ -22,7 +25,15 @@ class Priority(Enum):
     LOW = 4  # Channel messages
 
 
-@dataclass
+# Why each kind of item needs attention
+_REASONS = {
+    Priority.CRITICAL: 'You were mentioned',
+    Priority.HIGH: 'Direct message',
+    Priority.MEDIUM: 'Reply in thread you participated in',
+}
+
+
+@dataclass(slots=True)
 class StatusItem:
     """An item requiring attention."""
 
@@ -40,7 +51,7 @@ class StatusItem:
     metadata: dict[str, Any] = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(slots=True)
 class Status:
     """Complete status report."""
 
@@ -70,25 +81,35 @@ class StatusService:
             raise RuntimeError('Client not authenticated')
 
         since = datetime.now() - timedelta(hours=hours_back)
-        items: list[StatusItem] = []
-
-        # Get mentions (highest priority)
-        mentions = await self._get_mentions(since)
-        items.extend(mentions)
-
-        # Get DMs (high priority)
-        dms = await self._get_dms(since)
-        items.extend(dms)
+        user_id = self.client.user_id
 
-        # Get threads you participated in (medium priority)
-        threads = await self._get_thread_replies(since)
-        items.extend(threads)
-
-        # Get reminders
-        reminders = await self._get_reminders()
+        # Mentions (critical), DMs (high) and threads you participated in (medium) come back
+        # from one query with names already joined; reminders are fetched alongside it
+        rows, reminders = await asyncio.gather(
+            self.repository.get_attention_items(user_id, since),
+            self._get_reminders(),
+        )
 
-        # Sort by priority then timestamp
-        items.sort(key=lambda x: (x.priority.value, -(x.timestamp.timestamp() if x.timestamp else 0)))
+        items: list[StatusItem] = []
+        seen_threads: set[tuple[str, str]] = set()
+        for priority_value, msg, channel_name, user_name in rows:
+            priority = Priority(priority_value)
+            if priority is Priority.MEDIUM:
+                # Only the newest reply per thread
+                thread_key = (msg.channel_id, msg.thread_ts or msg.ts)
+                if thread_key in seen_threads:
+                    continue
+                seen_threads.add(thread_key)
+
+            items.append(self._make_item(msg, priority, channel_name, user_name, _REASONS[priority]))
+
+        # Sort by priority then newest first. Keys are computed in one pass and compared via
+        # itemgetter; sections already arrive newest-first, so Timsort finds long runs.
+        keyed = [
+            ((item.priority.value, -(item.timestamp.timestamp() if item.timestamp else 0.0)), item) for item in items
+        ]
+        keyed.sort(key=itemgetter(0))
+        items = [item for _, item in keyed]
 
         return Status(
             items=items,
@@ -96,98 +117,28 @@ class StatusService:
             generated_at=datetime.now(),
         )
 
-    async def _get_mentions(self, since: datetime) -> list[StatusItem]:
-        """Get messages that mention the current user."""
-        messages = await self.repository.get_unread_mentions(self.client.user_id, since)
-        items = []
-
-        for msg in messages:
-            channel = await self.repository.get_channel(msg.channel_id)
-            user = await self.repository.get_user(msg.user_id) if msg.user_id else None
-
-            items.append(
-                StatusItem(
-                    priority=Priority.CRITICAL,
-                    channel_id=msg.channel_id,
-                    channel_name=channel.name if channel else None,
-                    message_ts=msg.ts,
-                    thread_ts=msg.thread_ts,
-                    user_id=msg.user_id,
-                    user_name=user.display_name or user.name if user else None,
-                    text_preview=self._truncate(msg.text or '', 100),
-                    timestamp=msg.created_at,
-                    link=self.client.get_message_link(msg.channel_id, msg.ts, msg.thread_ts),
-                    reason='You were mentioned',
-                )
-            )
-
-        return items
-
-    async def _get_dms(self, since: datetime) -> list[StatusItem]:
-        """Get recent DM messages."""
-        messages = await self.repository.get_dm_messages(since)
-        items = []
-
-        # Filter out messages from self
-        messages = [m for m in messages if m.user_id != self.client.user_id]
-
-        for msg in messages:
-            channel = await self.repository.get_channel(msg.channel_id)
-            user = await self.repository.get_user(msg.user_id) if msg.user_id else None
-
-            items.append(
-                StatusItem(
-                    priority=Priority.HIGH,
-                    channel_id=msg.channel_id,
-                    channel_name=channel.name if channel else None,
-                    message_ts=msg.ts,
-                    thread_ts=msg.thread_ts,
-                    user_id=msg.user_id,
-                    user_name=user.display_name or user.name if user else None,
-                    text_preview=self._truncate(msg.text or '', 100),
-                    timestamp=msg.created_at,
-                    link=self.client.get_message_link(msg.channel_id, msg.ts, msg.thread_ts),
-                    reason='Direct message',
-                )
-            )
-
-        return items
-
-    async def _get_thread_replies(self, since: datetime) -> list[StatusItem]:
-        """Get replies in threads the user participated in."""
-        thread_data = await self.repository.get_threads_with_replies(self.client.user_id, since)
-        items = []
-
-        seen_threads = set()
-        for row in thread_data:
-            thread_key = f'{row["channel_id"]}:{row.get("thread_ts") or row["ts"]}'
-            if thread_key in seen_threads:
-                continue
-            seen_threads.add(thread_key)
-
-            user = await self.repository.get_user(row['user_id']) if row.get('user_id') else None
-
-            items.append(
-                StatusItem(
-                    priority=Priority.MEDIUM,
-                    channel_id=row['channel_id'],
-                    channel_name=row.get('channel_name'),
-                    message_ts=row['ts'],
-                    thread_ts=row.get('thread_ts'),
-                    user_id=row.get('user_id'),
-                    user_name=user.display_name or user.name if user else None,
-                    text_preview=self._truncate(row.get('text') or '', 100),
-                    timestamp=row.get('created_at'),
-                    link=self.client.get_message_link(
-                        row['channel_id'],
-                        row['ts'],
-                        row.get('thread_ts'),
-                    ),
-                    reason='Reply in thread you participated in',
-                )
-            )
-
-        return items
+    def _make_item(
+        self,
+        msg: Message,
+        priority: Priority,
+        channel_name: str | None,
+        user_name: str | None,
+        reason: str,
+    ) -> StatusItem:
+        """Build a status item for a message."""
+        return StatusItem(
+            priority=priority,
+            channel_id=msg.channel_id,
+            channel_name=channel_name,
+            message_ts=msg.ts,
+            thread_ts=msg.thread_ts,
+            user_id=msg.user_id,
+            user_name=user_name,
+            text_preview=self._truncate(msg.text or '', 100),
+            timestamp=msg.created_at,
+            link=self.client.get_message_link(msg.channel_id, msg.ts, msg.thread_ts),
+            reason=reason,
+        )
 
     async def _get_reminders(self) -> list[dict[str, Any]]:
         """Get pending reminders (Later section)."""
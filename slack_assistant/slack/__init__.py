@@ -1,7 +1,7 @@
 """Slack integration module."""
 
-from slack_assistant.slack.client import SlackClient
+from slack_assistant.slack.client import SlackClient, close_http_session, get_http_session
 from slack_assistant.slack.poller import SlackPoller
 
 
-__all__ = ['SlackClient', 'SlackPoller']
+__all__ = ['SlackClient', 'SlackPoller', 'close_http_session', 'get_http_session']
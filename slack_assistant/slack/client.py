@@ -1,24 +1,103 @@
 """Slack API client wrapper."""
 
+import asyncio
 import logging
+import time
+from functools import lru_cache
 from typing import Any
 
+import aiohttp
 from slack_sdk.errors import SlackApiError
+from slack_sdk.http_retry.builtin_async_handlers import AsyncRateLimitErrorRetryHandler
 from slack_sdk.web.async_client import AsyncWebClient
 
 
 logger = logging.getLogger(__name__)
 
+_http_session: aiohttp.ClientSession | None = None
+
+# Requests per minute for the Web API tiers of the methods we call (limits are per method, per workspace)
+_TIER_2 = 20
+_TIER_3 = 50
+_TIER_4 = 100
+
+
+def get_http_session() -> aiohttp.ClientSession:
+    """Get or create the shared HTTP session (keep-alive connections to Slack).
+
+    Must be called from within a running event loop.
+    """
+    global _http_session
+    if _http_session is None or _http_session.closed:
+        # Sized for the poller's fan-out: parallel channels with page prefetch, thread replies and user lookups
+        _http_session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=50, keepalive_timeout=60, ttl_dns_cache=300),
+        )
+    return _http_session
+
+
+async def close_http_session() -> None:
+    """Close the shared HTTP session."""
+    global _http_session
+    if _http_session is not None:
+        await _http_session.close()
+        _http_session = None
+
+
+@lru_cache(maxsize=4096)
+def _message_link(channel_id: str, message_ts: str, thread_ts: str | None) -> str:
+    """Build a message permalink; memoized since status/search reports repeat the same threads."""
+    ts_formatted = message_ts.replace('.', '')
+    base_url = f'https://slack.com/archives/{channel_id}/p{ts_formatted}'
+    if thread_ts and thread_ts != message_ts:
+        thread_formatted = thread_ts.replace('.', '')
+        base_url += f'?thread_ts={thread_formatted}'
+    return base_url
+
+
+class _TokenBucket:
+    """Token-bucket pacing: bursts up to `rate` calls, refilling at `rate` per `period` seconds."""
+
+    def __init__(self, rate: int, period: float = 60.0):
+        self.rate = rate
+        self.period = period
+        self._tokens = float(rate)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()  # Waiters are served in arrival order
+
+    async def acquire(self) -> None:
+        """Wait until a call is allowed, then consume one token."""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.rate, self._tokens + (now - self._updated) * self.rate / self.period)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) * self.period / self.rate)
+
 
 class SlackClient:
     """Async Slack API client wrapper."""
 
     def __init__(self, token: str):
-        self.client = AsyncWebClient(token=token)
+        # Honor Retry-After on HTTP 429 rather than relying on fixed client-side pacing
+        self.client = AsyncWebClient(
+            token=token,
+            session=get_http_session(),
+            retry_handlers=[AsyncRateLimitErrorRetryHandler(max_retry_count=3)],
+        )
         self.user_id: str | None = None
         self.user_name: str | None = None
         self.team_id: str | None = None
 
+        # Pace each method to its published tier so bursts don't end in 429 retries
+        self._conversations_limiter = _TokenBucket(_TIER_2)
+        self._history_limiter = _TokenBucket(_TIER_3)
+        self._replies_limiter = _TokenBucket(_TIER_3)
+        self._users_limiter = _TokenBucket(_TIER_4)
+
     async def authenticate(self) -> bool:
         """Verify token and get current user info."""
         try:
@@ -35,62 +114,77 @@ class SlackClient:
     async def get_conversations(self, types: str = 'public_channel,private_channel,mpim,im') -> list[dict[str, Any]]:
         """Fetch all conversations the user is a member of."""
         conversations = []
-        cursor = None
 
+        async def fetch(cursor: str | None) -> Any:
+            await self._conversations_limiter.acquire()
+            return await self.client.conversations_list(types=types, exclude_archived=True, limit=200, cursor=cursor)
+
+        def fetch_page(cursor: str | None) -> asyncio.Task:
+            return asyncio.create_task(fetch(cursor))
+
+        next_page: asyncio.Task | None = fetch_page(None)
         try:
-            while True:
-                response = await self.client.conversations_list(
-                    types=types,
-                    exclude_archived=True,
-                    limit=200,
-                    cursor=cursor,
-                )
+            while next_page is not None:
+                response = await next_page
+                next_page = None
+
+                # Request the following page before processing this one
+                cursor = response.get('response_metadata', {}).get('next_cursor')
+                if cursor:
+                    next_page = fetch_page(cursor)
 
                 for channel in response.get('channels', []):
                     if channel.get('is_member', True):  # DMs don't have is_member
                         conversations.append(channel)
 
-                cursor = response.get('response_metadata', {}).get('next_cursor')
-                if not cursor:
-                    break
-
             logger.debug(f'Found {len(conversations)} conversations')
             return conversations
 
         except SlackApiError as e:
             logger.error(f'Failed to fetch conversations: {e.response["error"]}')
             return []
+        finally:
+            if next_page is not None:
+                next_page.cancel()
 
     async def get_channel_history(
         self,
         channel_id: str,
         oldest: str | None = None,
         limit: int = 100,
+        latest: str | None = None,
     ) -> list[dict[str, Any]]:
-        """Fetch messages from a channel."""
-        messages = []
-        cursor = None
+        """Fetch up to `limit` of the newest messages between oldest and latest (exclusive), newest first."""
+        messages: list[dict[str, Any]] = []
 
-        try:
-            while True:
-                kwargs: dict[str, Any] = {
-                    'channel': channel_id,
-                    'limit': min(limit - len(messages), 100),
-                }
-                if oldest:
-                    kwargs['oldest'] = oldest
-                if cursor:
-                    kwargs['cursor'] = cursor
+        async def fetch(kwargs: dict[str, Any]) -> Any:
+            await self._history_limiter.acquire()
+            return await self.client.conversations_history(**kwargs)
 
-                response = await self.client.conversations_history(**kwargs)
-                messages.extend(response.get('messages', []))
+        def fetch_page(cursor: str | None, page_limit: int) -> asyncio.Task:
+            kwargs: dict[str, Any] = {'channel': channel_id, 'limit': page_limit}
+            if oldest:
+                kwargs['oldest'] = oldest
+            if latest:
+                kwargs['latest'] = latest
+            if cursor:
+                kwargs['cursor'] = cursor
+            return asyncio.create_task(fetch(kwargs))
 
-                if len(messages) >= limit:
-                    break
+        next_page: asyncio.Task | None = fetch_page(None, min(limit, 100))
+        try:
+            while next_page is not None:
+                response = await next_page
+                next_page = None
+                page = response.get('messages', [])
 
+                # Request the following page before processing this one
+                remaining = limit - len(messages) - len(page)
                 cursor = response.get('response_metadata', {}).get('next_cursor')
-                if not cursor:
-                    break
+                if remaining > 0 and cursor:
+                    next_page = fetch_page(cursor, min(remaining, 100))
+
+                messages.extend(page)
 
             return messages
 
@@ -99,6 +193,9 @@ class SlackClient:
             if error not in ('channel_not_found', 'not_in_channel'):
                 logger.warning(f'Failed to fetch history for {channel_id}: {error}')
             return []
+        finally:
+            if next_page is not None:
+                next_page.cancel()
 
     async def get_thread_replies(
         self,
@@ -108,6 +205,7 @@ class SlackClient:
     ) -> list[dict[str, Any]]:
         """Fetch replies in a thread."""
         try:
+            await self._replies_limiter.acquire()
             response = await self.client.conversations_replies(
                 channel=channel_id,
                 ts=thread_ts,
@@ -123,6 +221,7 @@ class SlackClient:
     async def get_user_info(self, user_id: str) -> dict[str, Any] | None:
         """Get user information."""
         try:
+            await self._users_limiter.acquire()
             response = await self.client.users_info(user=user_id)
             return response.get('user')
         except SlackApiError as e:
@@ -154,9 +253,4 @@ class SlackClient:
 
     def get_message_link(self, channel_id: str, message_ts: str, thread_ts: str | None = None) -> str:
         """Generate a Slack message permalink."""
-        ts_formatted = message_ts.replace('.', '')
-        base_url = f'https://slack.com/archives/{channel_id}/p{ts_formatted}'
-        if thread_ts and thread_ts != message_ts:
-            thread_formatted = thread_ts.replace('.', '')
-            base_url += f'?thread_ts={thread_formatted}'
-        return base_url
+        return _message_link(channel_id, message_ts, thread_ts)
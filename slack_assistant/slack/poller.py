@@ -2,17 +2,73 @@
 
 import asyncio
 import logging
+import time
+from collections import OrderedDict
+from collections.abc import Iterable
 from datetime import datetime
 from typing import Any
 
 from slack_assistant.config import get_config
-from slack_assistant.db.models import Channel, Message, SyncState, User
+from slack_assistant.db.models import Channel, Message, SyncState, User, without_keys
 from slack_assistant.db.repository import Repository
 from slack_assistant.slack.client import SlackClient
 
 
 logger = logging.getLogger(__name__)
 
+# User IDs remembered as already stored, so repeat authors skip the database lookup
+_KNOWN_USERS_MAXSIZE = 10_000
+# User IDs Slack couldn't resolve (deleted users, some bots) aren't retried for an hour
+_MISSING_USERS_MAXSIZE = 1024
+_MISSING_USERS_TTL = 3600.0
+# Slack keys stored in dedicated columns rather than metadata
+_CHANNEL_RESERVED = frozenset({'id', 'name', 'is_archived', 'created'})
+_USER_RESERVED = frozenset({'id', 'name', 'real_name', 'is_bot'})
+
+# Conversation flags in precedence order, mapped to channel types; anything else is public
+_TYPE_FLAGS = (('is_im', 'im'), ('is_mpim', 'mpim'), ('is_private', 'private_channel'))
+
+# Messages per conversations.history fetch; a full page means older ones may remain
+_HISTORY_PAGE_SIZE = 100
+# Backlog pages fetched per channel per poll, across all of its gaps
+_CATCHUP_PAGES_PER_POLL = 3
+# Open backlog gaps kept per channel; beyond this the two oldest are merged
+_MAX_CATCHUP_GAPS = 20
+# History pages at least this long are parsed in a worker thread; below it the thread hop costs more than it saves
+_THREAD_PARSE_MIN_MESSAGES = 500
+# conversations.replies requests in flight at once, shared across all channels
+_MAX_PARALLEL_THREADS = 8
+# Growth factor for the poll interval after a cycle with no new messages
+_IDLE_BACKOFF = 1.5
+
+
+class _LRUCache(OrderedDict):
+    """OrderedDict bounded to `maxsize`; setting a key refreshes it and evicts the least recent beyond the bound."""
+
+    def __init__(self, maxsize: int):
+        super().__init__()
+        self.maxsize = maxsize
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        if key in self:
+            self.move_to_end(key)
+        super().__setitem__(key, value)
+        if len(self) > self.maxsize:
+            self.popitem(last=False)
+
+
+def _build_messages(
+    channel_id: str, messages: list[dict[str, Any]], oldest: str | None
+) -> list[tuple[Message, dict[str, Any]]]:
+    """Parse history oldest-first into (Message, raw payload) pairs, skipping timestamps at or before oldest."""
+    parsed = []
+    for msg_data in reversed(messages):
+        # Check the raw ts first so already-seen rows are never materialized
+        if oldest and msg_data.get('ts', '') <= oldest:
+            continue
+        parsed.append((Message.from_slack(channel_id, msg_data), msg_data))
+    return parsed
+
 
 class SlackPoller:
     """Background poller that syncs Slack data to the database."""
@@ -26,8 +82,16 @@ class SlackPoller:
         self.client = client
         self.repository = repository
         self.poll_interval = poll_interval or get_config().poll_interval_seconds
+        self.max_poll_interval = max(self.poll_interval, get_config().max_poll_interval_seconds)
         self._running = False
         self._channels: dict[str, dict[str, Any]] = {}
+        self._channel_objs: dict[str, Channel] = {}  # Channels from the last _sync_channels, polled each cycle
+        self._last_channel_hash: int | None = None  # Fingerprint of the channel list last written to the DB
+        self._known_users = _LRUCache(_KNOWN_USERS_MAXSIZE)  # User IDs present in the DB -> None
+        self._missing_users = _LRUCache(_MISSING_USERS_MAXSIZE)  # User ID -> monotonic retry time
+        self._user_lookups: dict[str, asyncio.Task[None]] = {}  # In-flight lookups shared by concurrent callers
+        self._channel_sem = asyncio.Semaphore(max(1, get_config().max_parallel_channels))
+        self._thread_sem = asyncio.Semaphore(_MAX_PARALLEL_THREADS)
 
     async def start(self) -> None:
         """Start the polling loop."""
@@ -36,31 +100,35 @@ class SlackPoller:
                 raise RuntimeError('Failed to authenticate with Slack')
 
         self._running = True
-        logger.info(f'Starting poller (interval: {self.poll_interval}s)')
+        logger.info('Starting poller (interval: %ss)', self.poll_interval)
 
         # Initial sync
         await self._sync_channels()
         await self._sync_all_messages()
 
-        # Main polling loop
+        # Main polling loop; back off while the workspace is quiet, snap back on new messages
         poll_count = 0
+        interval: float = self.poll_interval
         while self._running:
             try:
-                await asyncio.sleep(self.poll_interval)
+                await asyncio.sleep(interval)
                 poll_count += 1
-                logger.debug(f'Poll #{poll_count}')
+                logger.debug('Poll #%d (interval: %.0fs)', poll_count, interval)
 
                 # Refresh channel list periodically
                 if poll_count % 10 == 0:
                     await self._sync_channels()
 
-                await self._sync_all_messages()
+                if await self._sync_all_messages():
+                    interval = self.poll_interval
+                else:
+                    interval = min(interval * _IDLE_BACKOFF, self.max_poll_interval)
 
             except asyncio.CancelledError:
                 logger.info('Poller cancelled')
                 break
             except Exception as e:
-                logger.exception(f'Error in polling loop: {e}')
+                logger.exception('Error in polling loop: %s', e)
                 await asyncio.sleep(5)  # Brief pause before retrying
 
     def stop(self) -> None:
@@ -73,6 +141,7 @@ class SlackPoller:
         logger.info('Syncing channels...')
         conversations = await self.client.get_conversations()
 
+        channel_objs: dict[str, Channel] = {}
         for conv in conversations:
             channel = Channel(
                 id=conv['id'],
@@ -80,101 +149,199 @@ class SlackPoller:
                 channel_type=self._get_channel_type(conv),
                 is_archived=conv.get('is_archived', False),
                 created_at=datetime.fromtimestamp(conv['created']) if conv.get('created') else None,
-                metadata={k: v for k, v in conv.items() if k not in ('id', 'name', 'is_archived', 'created')},
+                metadata=without_keys(conv, _CHANNEL_RESERVED),
             )
-            await self.repository.upsert_channel(channel)
             self._channels[channel.id] = conv
+            channel_objs[channel.id] = channel
 
-        logger.info(f'Synced {len(conversations)} channels')
-
-    def _get_channel_type(self, conv: dict[str, Any]) -> str:
-        """Determine channel type from conversation data."""
-        if conv.get('is_im'):
-            return 'im'
-        if conv.get('is_mpim'):
-            return 'mpim'
-        if conv.get('is_private'):
-            return 'private_channel'
-        return 'public_channel'
-
-    async def _sync_all_messages(self) -> None:
-        """Sync messages from all channels."""
-        channels = await self.repository.get_all_channels()
-
-        for channel in channels:
-            await self._sync_channel_messages(channel)
-            # Small delay to avoid rate limits
-            await asyncio.sleep(0.2)
+        # Replace wholesale so channels we've left or that were archived stop being polled
+        self._channel_objs = channel_objs
 
-    async def _sync_channel_messages(self, channel: Channel) -> None:
-        """Sync messages from a single channel."""
-        # Get sync state
-        sync_state = await self.repository.get_sync_state(channel.id)
-        oldest = sync_state.last_ts if sync_state else None
-
-        # Fetch new messages
-        messages = await self.client.get_channel_history(channel.id, oldest=oldest)
-        if not messages:
+        # Skip the writes when no stored column changed since the last refresh (metadata-only
+        # changes such as topic or member count wait until one does)
+        channel_hash = hash(tuple((c.id, c.name, c.channel_type, c.is_archived) for c in channel_objs.values()))
+        if channel_hash == self._last_channel_hash:
+            logger.info('Channel list unchanged (%d channels)', len(conversations))
             return
 
-        # Messages are returned newest-first
-        newest_ts = messages[0].get('ts')
-        messages = list(reversed(messages))  # Process oldest first
-
-        new_count = 0
-        for msg_data in messages:
-            msg = Message.from_slack(channel.id, msg_data)
-
-            # Skip if we've already seen this exact timestamp
-            if oldest and msg.ts <= oldest:
-                continue
-
-            # Store message
-            message_id = await self.repository.upsert_message(msg)
+        # Concurrent upserts spread over the pool; the TaskGroup cancels the rest if one fails
+        async with asyncio.TaskGroup() as tg:
+            for channel in channel_objs.values():
+                tg.create_task(self.repository.upsert_channel(channel))
+        self._last_channel_hash = channel_hash
+        logger.info('Synced %d channels', len(conversations))
 
-            # Store reactions
-            if reactions := msg_data.get('reactions'):
-                await self.repository.upsert_reactions(message_id, reactions)
+    @staticmethod
+    def _get_channel_type(conv: dict[str, Any]) -> str:
+        """Determine channel type from conversation data."""
+        for flag, channel_type in _TYPE_FLAGS:
+            if conv.get(flag):
+                return channel_type
+        return 'public_channel'
 
-            # Sync thread replies if this is a thread parent
-            if msg.reply_count > 0:
-                await self._sync_thread_replies(channel.id, msg.ts)
+    async def _sync_all_messages(self) -> int:
+        """Sync messages from all channels, returning the number of new messages."""
+        # The in-memory list is refreshed by _sync_channels; the DB is only a fallback before the first one
+        channels = list(self._channel_objs.values()) or await self.repository.get_all_channels()
 
-            new_count += 1
+        # Bounded fan-out; the client's rate-limit retry handler absorbs any 429s
+        results = await asyncio.gather(
+            *(self._sync_channel_bounded(channel) for channel in channels), return_exceptions=True
+        )
+        new_count = 0
+        for channel, result in zip(channels, results):
+            if isinstance(result, BaseException):
+                logger.error('Failed to sync #%s: %s', channel.name or channel.id, result, exc_info=result)
+            else:
+                new_count += result
+        return new_count
+
+    async def _sync_channel_bounded(self, channel: Channel) -> int:
+        """Sync a channel once a concurrency slot is free."""
+        async with self._channel_sem:
+            return await self._sync_channel_messages(channel)
+
+    async def _sync_channel_messages(self, channel: Channel) -> int:
+        """Sync messages from a single channel, returning the number of new messages."""
+        state = await self.repository.get_sync_state(channel.id) or SyncState(channel_id=channel.id)
+        oldest = state.last_ts
+
+        # Newest page since the last sync (newest-first)
+        messages = await self.client.get_channel_history(channel.id, oldest=oldest, limit=_HISTORY_PAGE_SIZE)
+        if not messages and not state.catchup_gaps:
+            return 0
+        parsed = await self._parse_history(channel.id, messages, oldest)
+
+        # Plus a few pages of backlog left by earlier polls; all of it is older than last_ts
+        backfilled = await self._walk_catchup_gaps(channel.id, state)
+
+        # A full page may have left older messages behind. The new gap lies entirely above the open
+        # ones (they are all below last_ts), so it is tracked separately and nothing is walked twice.
+        # A first sync has no lower bound, so it keeps only the newest page rather than the whole history.
+        if oldest and len(messages) >= _HISTORY_PAGE_SIZE:
+            state.catchup_gaps.insert(0, [oldest, messages[-1]['ts']])
+            if len(state.catchup_gaps) > _MAX_CATCHUP_GAPS:
+                # Bound the state by merging the two oldest gaps, re-fetching the stretch between them
+                older_oldest, _ = state.catchup_gaps.pop()
+                state.catchup_gaps[-1][0] = older_oldest
+
+        # Pass 2: write the page in one transaction before anything else touches those rows; thread
+        # replies can overlap it (broadcast replies, parents), so they must not race the page upsert
+        parsed = backfilled + parsed
+        await self.repository.upsert_messages_with_reactions(
+            [msg for msg, _ in parsed],
+            {(channel.id, msg.ts): reactions for msg, msg_data in parsed if (reactions := msg_data.get('reactions'))},
+        )
 
-            # Cache user info if not seen before
-            if msg.user_id:
-                await self._ensure_user_cached(msg.user_id)
+        # Then resolve authors and fetch threads concurrently; each thread is its own disjoint set of rows,
+        # and the TaskGroup cancels the siblings if one fails instead of leaving them running unobserved
+        async with asyncio.TaskGroup() as tg:
+            tg.create_task(self._ensure_users_cached(msg.user_id for msg, _ in parsed))
+            for msg, _ in parsed:
+                if msg.reply_count > 0:
+                    tg.create_task(self._sync_thread_replies(channel.id, msg.ts))
 
+        # Only messages newer than last_ts are new; backlog pages are reported separately
+        new_count = len(parsed) - len(backfilled)
         if new_count > 0:
-            logger.info(f'Synced {new_count} new messages from #{channel.name or channel.id}')
+            logger.info('Synced %d new messages from #%s', new_count, channel.name or channel.id)
+        if backfilled:
+            logger.info(
+                'Backfilled %d older messages in #%s (%d gaps left)',
+                len(backfilled),
+                channel.name or channel.id,
+                len(state.catchup_gaps),
+            )
 
         # Update sync state
-        if newest_ts:
-            await self.repository.upsert_sync_state(SyncState(channel_id=channel.id, last_ts=newest_ts))
+        if messages:
+            state.last_ts = messages[0].get('ts') or state.last_ts
+        await self.repository.upsert_sync_state(state)
+
+        return new_count
+
+    async def _walk_catchup_gaps(self, channel_id: str, state: SyncState) -> list[tuple[Message, dict[str, Any]]]:
+        """Fetch a few backlog pages, newest gap first, narrowing state.catchup_gaps to what is still missing."""
+        backfilled: list[tuple[Message, dict[str, Any]]] = []
+        pages = 0
+        remaining = []
+        for gap_oldest, cursor in state.catchup_gaps:
+            while cursor and pages < _CATCHUP_PAGES_PER_POLL:
+                page = await self.client.get_channel_history(
+                    channel_id, oldest=gap_oldest, latest=cursor, limit=_HISTORY_PAGE_SIZE
+                )
+                pages += 1
+                # Pages are walked downward, so each one goes in front of the newer rows already collected
+                backfilled = await self._parse_history(channel_id, page, gap_oldest) + backfilled
+                cursor = page[-1]['ts'] if len(page) >= _HISTORY_PAGE_SIZE else None
+            if cursor:
+                remaining.append([gap_oldest, cursor])
+        state.catchup_gaps = remaining
+        return backfilled
+
+    async def _parse_history(
+        self, channel_id: str, messages: list[dict[str, Any]], oldest: str | None
+    ) -> list[tuple[Message, dict[str, Any]]]:
+        """Parse a history page oldest-first, off the event loop for big pages so other channels keep fetching."""
+        if len(messages) >= _THREAD_PARSE_MIN_MESSAGES:
+            return await asyncio.to_thread(_build_messages, channel_id, messages, oldest)
+        return _build_messages(channel_id, messages, oldest)
 
     async def _sync_thread_replies(self, channel_id: str, thread_ts: str) -> None:
         """Sync replies in a thread."""
-        replies = await self.client.get_thread_replies(channel_id, thread_ts)
+        async with self._thread_sem:
+            replies = await self.client.get_thread_replies(channel_id, thread_ts)
+        if not replies:
+            return
 
-        for reply_data in replies:
-            reply = Message.from_slack(channel_id, reply_data)
-            message_id = await self.repository.upsert_message(reply)
+        # One multi-row upsert for the whole thread, reactions included
+        parsed = [Message.from_slack(channel_id, reply_data) for reply_data in replies]
+        await self.repository.upsert_messages_with_reactions(
+            parsed,
+            {
+                (channel_id, reply.ts): reactions
+                for reply, reply_data in zip(parsed, replies)
+                if (reactions := reply_data.get('reactions'))
+            },
+        )
 
-            if reactions := reply_data.get('reactions'):
-                await self.repository.upsert_reactions(message_id, reactions)
+        await self._ensure_users_cached(reply.user_id for reply in parsed)
+
+    async def _ensure_users_cached(self, user_ids: Iterable[str | None]) -> None:
+        """Ensure each distinct, non-empty user ID is cached, fetching the missing ones concurrently."""
+        unknown = []
+        for user_id in {user_id for user_id in user_ids if user_id}:
+            if user_id in self._known_users:
+                self._known_users.move_to_end(user_id)
+            elif not self._is_missing_user(user_id):
+                unknown.append(user_id)
+        if not unknown:
+            return
 
-            if reply.user_id:
-                await self._ensure_user_cached(reply.user_id)
+        # One existence query for the batch; only IDs absent from the DB go to Slack
+        existing = await self.repository.get_existing_user_ids(unknown)
+        for user_id in existing:
+            self._known_users[user_id] = None
+        await asyncio.gather(*(self._ensure_user_fetched(user_id) for user_id in unknown if user_id not in existing))
 
-    async def _ensure_user_cached(self, user_id: str) -> None:
-        """Ensure user info is cached in the database."""
-        existing = await self.repository.get_user(user_id)
-        if existing:
+    async def _ensure_user_fetched(self, user_id: str) -> None:
+        """Fetch and store a user missing from the DB, sharing one lookup among concurrent callers."""
+        # Channels sync concurrently, so the same author can be requested twice at once
+        if user_id in self._known_users:
             return
-
+        task = self._user_lookups.get(user_id)
+        if task is None:
+            task = asyncio.create_task(self._fetch_user(user_id))
+            self._user_lookups[user_id] = task
+            task.add_done_callback(lambda _: self._user_lookups.pop(user_id, None))
+        await asyncio.shield(task)
+
+    async def _fetch_user(self, user_id: str) -> None:
+        """Fetch a user from Slack and store it."""
         user_info = await self.client.get_user_info(user_id)
         if not user_info:
+            # Skip Slack lookups for this user until the TTL passes
+            self._missing_users[user_id] = time.monotonic() + _MISSING_USERS_TTL
             return
 
         user = User(
@@ -183,6 +350,17 @@ class SlackPoller:
             real_name=user_info.get('real_name'),
             display_name=user_info.get('profile', {}).get('display_name'),
             is_bot=user_info.get('is_bot', False),
-            metadata={k: v for k, v in user_info.items() if k not in ('id', 'name', 'real_name', 'is_bot')},
+            metadata=without_keys(user_info, _USER_RESERVED),
         )
         await self.repository.upsert_user(user)
+        self._known_users[user_id] = None
+
+    def _is_missing_user(self, user_id: str) -> bool:
+        """Check whether Slack recently failed to resolve this user, dropping the entry once expired."""
+        retry_at = self._missing_users.get(user_id)
+        if retry_at is None:
+            return False
+        if retry_at <= time.monotonic():
+            del self._missing_users[user_id]
+            return False
+        return True